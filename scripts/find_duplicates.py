@@ -3,7 +3,7 @@
 Find duplicate video files across a source directory and one or more target directories.
 
 This script compares video files by extracting video IDs from filenames/folders
-(e.g., FC2-PPV-123456, MIDE-123) and optionally by SHA256 hash. It detects
+(e.g., FC2-PPV-123456, MIDE-123) and optionally by content hash. It detects
 whether files are hardlinked (same inode/file-ID) or true copies wasting disk
 space. When fixing duplicates the source directory is always kept; non-source
 copies are replaced with hardlinks to the source file.
@@ -18,7 +18,7 @@ Examples:
     # Compare against multiple target directories
     python find_duplicates.py /media/original /media/lib1 /media/lib2
 
-    # Also match by size + SHA256 hash (finds ID-less duplicates too)
+    # Also match by size + content hash (finds ID-less duplicates too)
     python find_duplicates.py /media/original /media/organized --content-match
 
     # Show only space-wasting copies
@@ -35,7 +35,8 @@ Examples:
 
 Options:
     --min-confidence FLOAT  Minimum ID extraction confidence (0.0-1.0) [default: 0.75]
-    --content-match         Also match by file size + SHA256 hash
+    --content-match         Also match by file size + content hash
+    --no-hash-cache         Re-hash every file (skip ~/.cache/taggerr/hashdb.sqlite)
     --show-hardlinks-only   Show only hardlinked files
     --show-copies-only      Show only true copy files (wasting space)
     --output-json PATH      Export results to JSON file
@@ -50,17 +51,19 @@ Understanding Results:
 
 Match Types:
     - [NAME]:         Matched by video ID extracted from filename/folder
-    - [CONTENT]:      Matched by file size + SHA256 hash only
+    - [CONTENT]:      Matched by file size + content hash only
     - [NAME+CONTENT]: Matched by both name and content (highest confidence)
 """
 
 import json
 import hashlib
+import os
 from pathlib import Path
 
 import click
 
 from taggrr.core.duplicate_detector import DuplicateDetector, DuplicateSet
+from taggrr.core.hash_cache import HashCache
 
 MIN_DUP_FILE_SIZE_BYTES = 100 * 1024 * 1024
 QUICK_HASH_SAMPLE_BYTES = 2 * 1024 * 1024
@@ -96,11 +99,13 @@ def compute_quick_hash(
       - otherwise first sample_bytes + last sample_bytes
     """
     sha256 = hashlib.sha256()
-    file_size = file_path.stat().st_size
-    sha256.update(str(file_size).encode("utf-8"))
-    sha256.update(b"\0")
-
     with open(file_path, "rb") as f:
+        # fstat the open handle: no second path lookup, and the size is
+        # that of the file actually being read
+        file_size = os.fstat(f.fileno()).st_size
+        sha256.update(str(file_size).encode("utf-8"))
+        sha256.update(b"\0")
+
         if file_size <= sample_bytes * 2:
             while chunk := f.read(8192):
                 sha256.update(chunk)
@@ -378,6 +383,8 @@ def fix_duplicates(
         click.echo(f"  Potential savings: {format_size(group.wasted_space)}")
         click.echo()
 
+        # The source is fingerprinted once per set, not once per copy
+        src_quick_hash: str | None = None
         for _src, copy_file in group.copy_pairs:
             copy_path = copy_file.file_path
             copy_size = copy_file.file_size or 0
@@ -413,7 +420,8 @@ def fix_duplicates(
 
             # Quick content fingerprint check (head+tail samples)
             try:
-                src_quick_hash = compute_quick_hash(source_file.file_path)
+                if src_quick_hash is None:
+                    src_quick_hash = compute_quick_hash(source_file.file_path)
                 copy_quick_hash = compute_quick_hash(copy_path)
                 if src_quick_hash != copy_quick_hash:
                     click.echo(
@@ -466,7 +474,12 @@ def fix_duplicates(
 @click.option(
     "--content-match",
     is_flag=True,
-    help="Also match by file size + SHA256 hash",
+    help="Also match by file size + content hash",
+)
+@click.option(
+    "--no-hash-cache",
+    is_flag=True,
+    help="Re-hash every file instead of reusing hashes from earlier scans",
 )
 @click.option(
     "--show-hardlinks-only", is_flag=True, help="Show only hardlinked sets"
@@ -494,6 +507,7 @@ def main(
     targets: tuple[Path, ...],
     min_confidence: float,
     content_match: bool,
+    no_hash_cache: bool,
     show_hardlinks_only: bool,
     show_copies_only: bool,
     output_json: Path | None,
@@ -529,15 +543,20 @@ def main(
     click.echo()
 
     # Scan
-    detector = DuplicateDetector()
+    hash_cache = HashCache() if content_match and not no_hash_cache else None
+    detector = DuplicateDetector(hash_cache=hash_cache)
     click.echo("Scanning directories...")
-    groups = detector.scan_multiple(
-        source,
-        target_dirs,
-        min_confidence=min_confidence,
-        content_match=content_match,
-        min_file_size_bytes=MIN_DUP_FILE_SIZE_BYTES,
-    )
+    try:
+        groups = detector.scan_multiple(
+            source,
+            target_dirs,
+            min_confidence=min_confidence,
+            content_match=content_match,
+            min_file_size_bytes=MIN_DUP_FILE_SIZE_BYTES,
+        )
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
 
     # Always show groups and summary first (even in fix mode).
     # Pure-HARDLINK sets are hidden by default (already optimal, not actionable).
@@ -0,0 +1,82 @@
+"""Deterministic fault injection for exercising API client resilience."""
+
+import random
+from dataclasses import dataclass
+
+import httpx
+
+# Faults ChaosMiddleware knows how to inject
+FAULTS = ("429", "500", "timeout", "badjson")
+
+
+@dataclass(frozen=True)
+class ChaosRule:
+    """Which fault to inject, how often, and for which requests."""
+
+    fault: str
+    rate: float = 1.0  # Probability that a matching request is faulted
+    match: str | None = None  # Only fault URLs containing this substring
+
+    def __post_init__(self):
+        if self.fault not in FAULTS:
+            raise ValueError(f"Unknown fault {self.fault!r}; expected one of {FAULTS}")
+        if not 0.0 <= self.rate <= 1.0:
+            raise ValueError("rate must be between 0 and 1")
+
+
+class ChaosMiddleware(httpx.AsyncBaseTransport):
+    """Transport wrapper that injects faults from a seeded rule.
+
+    Requests that are not faulted are passed to the wrapped transport, so
+    the same seed always faults the same sequence of requests.
+    """
+
+    def __init__(
+        self,
+        rule: ChaosRule,
+        seed: int = 0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize middleware.
+
+        Args:
+            rule: Fault to inject.
+            seed: Seed for the fault-rate RNG.
+            transport: Transport for healthy requests (default: real HTTP).
+        """
+        self.rule = rule
+        self.injected = 0
+        self._rng = random.Random(seed)
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Inject the configured fault or forward the request."""
+        if self._should_fault(request):
+            self.injected += 1
+            return self._inject(request)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
+
+    def _should_fault(self, request: httpx.Request) -> bool:
+        if self.rule.match is not None and self.rule.match not in str(request.url):
+            return False
+        return self._rng.random() < self.rule.rate
+
+    def _inject(self, request: httpx.Request) -> httpx.Response:
+        fault = self.rule.fault
+        if fault == "timeout":
+            raise httpx.ReadTimeout("Injected read timeout", request=request)
+        if fault == "429":
+            return httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+        if fault == "500":
+            return httpx.Response(500, text="Internal Server Error", request=request)
+        # badjson: claims JSON but is malformed
+        return httpx.Response(
+            200,
+            content=b"{not json",
+            headers={"content-type": "application/json"},
+            request=request,
+        )
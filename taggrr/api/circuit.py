@@ -0,0 +1,81 @@
+"""Circuit breaker for fast-failing requests to an unhealthy API host."""
+
+import time
+from collections.abc import Callable
+from enum import Enum
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests fail fast until the reset timeout elapses
+    HALF_OPEN = "half_open"  # A single probe request decides the next state
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then allows one probe per timeout."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to stay open before allowing a probe.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._fail_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current breaker state."""
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self._state is CircuitState.CLOSED:
+            return True
+
+        if self._state is CircuitState.OPEN:
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+
+        # HALF_OPEN: let exactly one probe through
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a healthy response; closes the circuit."""
+        self._state = CircuitState.CLOSED
+        self._fail_count = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request; may open the circuit."""
+        self._probe_in_flight = False
+        if self._state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+
+        self._fail_count += 1
+        if self._fail_count >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
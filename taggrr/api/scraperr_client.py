@@ -1,18 +1,60 @@
 """Client for scraperr API integration."""
 
 import asyncio
+import contextlib
+import json
 import logging
+import os
+import random
+import time
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+try:  # Optional C-accelerated JSON decoding
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:  # Optional HTTP/2 support (httpx[http2])
+    import h2  # noqa: F401
+
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
 from ..config.settings import TaggerrConfig
 from ..core.models import ConfidenceBreakdown, MatchResult, PlexMetadata, SourceType
+from .circuit import CircuitBreaker, CircuitState
 
 logger = logging.getLogger(__name__)
 
+# Upper bound (seconds) for a single retry wait
+MAX_RETRY_BACKOFF = 60.0
+
+# Bytes read per chunk when streaming assets to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# API source strings mapped to SourceType
+_SOURCE_MAP: dict[str, SourceType] = {
+    "fc2": SourceType.FC2,
+    "fc2-ppv": SourceType.FC2,
+    "dmm": SourceType.DMM,
+    "r18": SourceType.DMM,
+}
+
+# Prebuilt (read-only) query params per source hint; GENERIC sends no hint
+_SOURCE_PARAMS: dict[SourceType, dict[str, str]] = {
+    s: {"source": s.value} for s in SourceType if s is not SourceType.GENERIC
+}
+_NO_PARAMS: dict[str, str] = {}
+
 
 @dataclass
 class APIResponse:
@@ -34,11 +76,35 @@ class ScraperAPIClient:
         self.timeout = config.api.timeout
         self.max_retries = config.api.retries
         self.retry_delay = config.api.retry_delay
+        self.max_concurrency = config.api.max_concurrency
+        self.batch_threshold = config.api.batch_threshold
+        # Cleared once the server says it has no batch endpoint
+        self._batch_supported = True
+
+        # Bounds in-flight batch lookups so they never queue on the pool
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+
+        # One circuit breaker per API host
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        # HTTP client with custom timeout and retry settings; keep-alive
+        # connections are pooled and reused across requests
+        self.http2 = config.api.http2 and _HAS_H2
+        if config.api.http2 and not _HAS_H2:
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+
+        if self.http2:
+            # One multiplexed connection carries every concurrent stream
+            limits = httpx.Limits(
+                max_keepalive_connections=1, max_connections=1, keepalive_expiry=60
+            )
+        else:
+            limits = httpx.Limits(
+                max_keepalive_connections=20, max_connections=100, keepalive_expiry=30
+            )
 
-        # HTTP client with custom timeout and retry settings
         self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self.timeout),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            timeout=httpx.Timeout(self.timeout), limits=limits, http2=self.http2
         )
 
     async def __aenter__(self):
@@ -59,30 +125,74 @@ class ScraperAPIClient:
         """Search for video by ID."""
         endpoint = f"{self.base_url}/api/public/video/{video_id}"
 
-        params = {}
-        if source_hint and source_hint != SourceType.GENERIC:
-            params["source"] = source_hint.value
-
+        params = _SOURCE_PARAMS.get(source_hint, _NO_PARAMS)
         return await self._make_request("GET", endpoint, params=params)
 
     async def search_multiple_ids(
         self, video_ids: list[str], source_hint: SourceType | None = None
     ) -> dict[str, APIResponse]:
-        """Search for multiple video IDs concurrently."""
-        tasks = []
-        for video_id in video_ids:
-            task = self.search_video(video_id, source_hint)
-            tasks.append((video_id, task))
+        """Search for multiple video IDs concurrently.
+
+        Large batches go through the batch endpoint in one request; if that
+        fails (e.g. an older server without it), IDs are searched one by one.
+        """
+        if (
+            self._batch_supported
+            and self.batch_threshold
+            and len(video_ids) >= self.batch_threshold
+        ):
+            batch_results = await self.search_batch(video_ids, source_hint)
+            if batch_results is not None:
+                return batch_results
+            logger.info("Batch search unavailable, searching IDs individually")
+
+        async def search_one(video_id: str) -> APIResponse:
+            async with self._sem:
+                try:
+                    return await self.search_video(video_id, source_hint)
+                except Exception as e:
+                    logger.error(f"Error searching for video ID '{video_id}': {e}")
+                    return APIResponse(success=False, error=str(e))
+
+        responses = await asyncio.gather(*(search_one(vid) for vid in video_ids))
+        return dict(zip(video_ids, responses))
+
+    async def search_batch(
+        self, video_ids: list[str], source_hint: SourceType | None = None
+    ) -> dict[str, APIResponse] | None:
+        """Search many IDs with a single POST; None if the batch call failed.
+
+        The batch endpoint is optional on the server, so its failures never
+        count against the host's circuit breaker. It is only tried while the
+        circuit is closed, leaving any half-open probe to a per-ID search.
+        """
+        endpoint = f"{self.base_url}/api/public/video/batch"
+        if self._breaker_for(endpoint).state is not CircuitState.CLOSED:
+            return None
 
-        results = {}
-        for video_id, task in tasks:
-            try:
-                response = await task
-                results[video_id] = response
-            except Exception as e:
-                logger.error(f"Error searching for video ID '{video_id}': {e}")
-                results[video_id] = APIResponse(success=False, error=str(e))
+        payload: dict[str, Any] = {"ids": list(video_ids)}
+        if source_hint and source_hint != SourceType.GENERIC:
+            payload["source"] = source_hint.value
 
+        response = await self._request_with_retry("POST", endpoint, json_data=payload)
+        if response.status_code in (404, 405):
+            logger.info("Server has no batch endpoint; disabling batch search")
+            self._batch_supported = False
+        if not response.success or not isinstance(response.data, dict):
+            return None
+
+        # Response is keyed by the requested ID; missing/null entries not found
+        results = {}
+        for video_id in video_ids:
+            data = response.data.get(video_id)
+            if isinstance(data, dict):
+                results[video_id] = APIResponse(
+                    success=True, data=data, status_code=response.status_code
+                )
+            else:
+                results[video_id] = APIResponse(
+                    success=False, error="Video not found", status_code=404
+                )
         return results
 
     async def get_video_metadata(self, video_id: str) -> APIResponse:
@@ -90,18 +200,29 @@ class ScraperAPIClient:
         endpoint = f"{self.base_url}/api/public/video/{video_id}/metadata"
         return await self._make_request("GET", endpoint)
 
-    async def download_asset(self, asset_url: str, output_path: Path) -> bool:
-        """Download an asset (poster, fanart) from URL."""
+    async def download_asset(
+        self, asset_url: str, output_path: str | os.PathLike[str]
+    ) -> bool:
+        """Download an asset (poster, fanart) from URL, streaming it to disk."""
+        output_path = os.fspath(output_path)
         try:
-            response = await self.client.get(asset_url, follow_redirects=True)
-            response.raise_for_status()
-
-            # Ensure directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write file
-            with open(output_path, "wb") as f:
-                f.write(response.content)
+            async with self.client.stream(
+                "GET", asset_url, follow_redirects=True
+            ) as response:
+                response.raise_for_status()
+
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+                # Write in fixed-size chunks so memory stays O(chunk), not O(file)
+                try:
+                    with open(output_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                except BaseException:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(output_path)
+                    raise
 
             logger.info(f"Downloaded asset to {output_path}")
             return True
@@ -116,6 +237,46 @@ class ScraperAPIClient:
         url: str,
         params: dict | None = None,
         json_data: dict | None = None,
+    ) -> APIResponse:
+        """Make HTTP request, failing fast while the host's circuit is open."""
+        breaker = self._breaker_for(url)
+        if not breaker.allow_request():
+            return APIResponse(success=False, error="Circuit open", status_code=503)
+
+        try:
+            response = await self._request_with_retry(method, url, params, json_data)
+        except BaseException:
+            # A cancelled or crashed probe must still release the half-open
+            # slot; outside a probe it says nothing about the host's health
+            if breaker.state is CircuitState.HALF_OPEN:
+                breaker.record_failure()
+            raise
+
+        # Server errors and exhausted transport retries count against the host
+        if response.status_code is None or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for the URL's host."""
+        host = httpx.URL(url).host
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.config.api.circuit_failure_threshold,
+                reset_timeout=self.config.api.circuit_reset_timeout,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    async def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json_data: dict | None = None,
     ) -> APIResponse:
         """Make HTTP request with retry logic."""
         last_exception = None
@@ -128,8 +289,17 @@ class ScraperAPIClient:
 
                 # Handle different response codes
                 if response.status_code == 200:
+                    # Gateways often answer with HTML; reject without parsing
+                    ctype = response.headers.get("content-type", "")
+                    if ctype and "json" not in ctype:
+                        return APIResponse(
+                            success=False,
+                            error=f"Invalid JSON response (content-type={ctype})",
+                            status_code=response.status_code,
+                        )
+
                     try:
-                        data = response.json()
+                        data = _json_loads(response.content)
                         return APIResponse(
                             success=True, data=data, status_code=response.status_code
                         )
@@ -146,13 +316,16 @@ class ScraperAPIClient:
                     )
 
                 elif response.status_code == 429:
-                    # Rate limited - wait longer before retry
+                    # Rate limited - back off, never sooner than Retry-After
                     if attempt < self.max_retries:
-                        wait_time = self.retry_delay * (
-                            2**attempt
-                        )  # Exponential backoff
+                        wait_time = self._backoff_delay(attempt)
+                        retry_after = self._parse_retry_after(response)
+                        if retry_after is not None:
+                            wait_time = min(
+                                MAX_RETRY_BACKOFF, max(wait_time, retry_after)
+                            )
                         logger.warning(
-                            f"Rate limited, waiting {wait_time}s before retry"
+                            f"Rate limited, waiting {wait_time:.2f}s before retry"
                         )
                         await asyncio.sleep(wait_time)
                         continue
@@ -173,7 +346,7 @@ class ScraperAPIClient:
                     logger.warning(
                         f"Request timeout, retrying... (attempt {attempt + 1}/{self.max_retries + 1})"
                     )
-                    await asyncio.sleep(self.retry_delay)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
 
             except httpx.ConnectError as e:
@@ -182,7 +355,7 @@ class ScraperAPIClient:
                     logger.warning(
                         f"Connection error, retrying... (attempt {attempt + 1}/{self.max_retries + 1})"
                     )
-                    await asyncio.sleep(self.retry_delay)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
 
             except Exception as e:
@@ -195,6 +368,59 @@ class ScraperAPIClient:
             error=f"Request failed after {self.max_retries + 1} attempts: {last_exception}",
         )
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at MAX_RETRY_BACKOFF."""
+        # Jitter spreads out retries from concurrent searches hitting one limit
+        return min(MAX_RETRY_BACKOFF, random.uniform(0, self.retry_delay * 2**attempt))
+
+    @staticmethod
+    def _parse_retry_after(response: httpx.Response) -> float | None:
+        """Parse a Retry-After header (delta-seconds or HTTP-date) in seconds."""
+        value = response.headers.get("Retry-After")
+        if not isinstance(value, str):
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+@lru_cache(maxsize=4096)
+def _match_confidence(
+    api_confidence: float,
+    id_matches: bool,
+    api_source: str,
+    source_hint: SourceType | None,
+) -> ConfidenceBreakdown:
+    """Confidence breakdown for an API match (pure; memoized per inputs)."""
+    # ID match confidence
+    id_match = 0.9 if id_matches else 0.7
+
+    # Source match confidence
+    source_match = 0.8
+    if source_hint and source_hint != SourceType.GENERIC:
+        if api_source == source_hint.value:
+            source_match = 0.95
+        elif api_source:
+            source_match = 0.6  # Conflicting sources
+
+    # Overall confidence calculation
+    overall = api_confidence * 0.4 + id_match * 0.4 + source_match * 0.2
+
+    return ConfidenceBreakdown(
+        folder_name_match=0.0,  # Not applicable for API matches
+        file_name_match=0.0,  # Not applicable for API matches
+        source_match=source_match,
+        overall_confidence=overall,
+    )
+
 
 class MetadataProcessor:
     """Processes scraperr API responses into standardized formats."""
@@ -263,62 +489,26 @@ class MetadataProcessor:
         self, data: dict, original_id: str, source_hint: SourceType | None = None
     ) -> ConfidenceBreakdown:
         """Calculate confidence scores for the match."""
-        # Base confidence from API response
-        api_confidence = data.get("confidence", 0.8)  # Default if not provided
-
-        # ID match confidence
-        id_match = 0.9 if data.get("id") == original_id else 0.7
-
-        # Source match confidence
-        source_match = 0.8
-        if source_hint and source_hint != SourceType.GENERIC:
-            detected_source = data.get("source", "").lower()
-            if detected_source == source_hint.value:
-                source_match = 0.95
-            elif detected_source and detected_source != source_hint.value:
-                source_match = 0.6  # Conflicting sources
-
-        # Overall confidence calculation
-        overall = api_confidence * 0.4 + id_match * 0.4 + source_match * 0.2
-
-        return ConfidenceBreakdown(
-            folder_name_match=0.0,  # Not applicable for API matches
-            file_name_match=0.0,  # Not applicable for API matches
-            source_match=source_match,
-            overall_confidence=overall,
+        return _match_confidence(
+            data.get("confidence", 0.8),  # Default if not provided
+            data.get("id") == original_id,
+            (data.get("source") or "").lower(),
+            source_hint,
         )
 
     def _determine_source(
         self, data: dict, source_hint: SourceType | None = None
     ) -> SourceType:
         """Determine the source type from API response."""
-        api_source = data.get("source", "").lower()
-
-        # Map API source strings to SourceType
-        source_mapping = {
-            "fc2": SourceType.FC2,
-            "fc2-ppv": SourceType.FC2,
-            "dmm": SourceType.DMM,
-            "r18": SourceType.DMM,
-        }
-
-        detected_source = source_mapping.get(api_source, SourceType.GENERIC)
+        api_source = (data.get("source") or "").strip().lower()
 
         # Use hint if detection failed
-        if detected_source == SourceType.GENERIC and source_hint:
-            return source_hint
-
-        return detected_source
+        return _SOURCE_MAP.get(api_source) or source_hint or SourceType.GENERIC
 
     def _generate_output_name(self, metadata: PlexMetadata) -> str:
         """Generate Plex-compatible output name."""
-        title = metadata.title
         year = metadata.year
-
-        if year:
-            return f"{title} ({year})"
-        else:
-            return title
+        return f"{metadata.title} ({year})" if year else metadata.title
 
 
 class VideoMatcher:
@@ -328,6 +518,20 @@ class VideoMatcher:
         """Initialize matcher with configuration."""
         self.config = config
         self.processor = MetadataProcessor(config)
+        # One long-lived client so lookups and downloads share pooled connections
+        self._client = ScraperAPIClient(config)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def close(self):
+        """Close the shared API client."""
+        await self._client.close()
 
     async def match_video(
         self,
@@ -336,39 +540,38 @@ class VideoMatcher:
         source_hint: SourceType | None = None,
     ) -> MatchResult | None:
         """Match video using primary ID and alternatives."""
-        async with ScraperAPIClient(self.config) as client:
-            # Try primary ID first
-            response = await client.search_video(primary_id, source_hint)
-            match = self.processor.process_search_response(
-                response, primary_id, source_hint
+        # Try primary ID first
+        response = await self._client.search_video(primary_id, source_hint)
+        match = self.processor.process_search_response(
+            response, primary_id, source_hint
+        )
+
+        if match and match.confidence_breakdown.overall_confidence > 0.6:
+            logger.info(
+                f"Found match for primary ID '{primary_id}' with confidence {match.confidence_breakdown.overall_confidence:.2f}"
             )
+            return match
 
-            if match and match.confidence_breakdown.overall_confidence > 0.6:
-                logger.info(
-                    f"Found match for primary ID '{primary_id}' with confidence {match.confidence_breakdown.overall_confidence:.2f}"
-                )
-                return match
+        # Try alternative IDs if primary failed
+        if alternative_ids:
+            logger.info(
+                f"Primary ID failed, trying {len(alternative_ids)} alternatives"
+            )
 
-            # Try alternative IDs if primary failed
-            if alternative_ids:
-                logger.info(
-                    f"Primary ID failed, trying {len(alternative_ids)} alternatives"
+            for alt_id in alternative_ids:
+                response = await self._client.search_video(alt_id, source_hint)
+                match = self.processor.process_search_response(
+                    response, alt_id, source_hint
                 )
 
-                for alt_id in alternative_ids:
-                    response = await client.search_video(alt_id, source_hint)
-                    match = self.processor.process_search_response(
-                        response, alt_id, source_hint
+                if match and match.confidence_breakdown.overall_confidence > 0.5:
+                    logger.info(
+                        f"Found match for alternative ID '{alt_id}' with confidence {match.confidence_breakdown.overall_confidence:.2f}"
                     )
+                    return match
 
-                    if match and match.confidence_breakdown.overall_confidence > 0.5:
-                        logger.info(
-                            f"Found match for alternative ID '{alt_id}' with confidence {match.confidence_breakdown.overall_confidence:.2f}"
-                        )
-                        return match
-
-            logger.warning(f"No suitable matches found for video ID '{primary_id}'")
-            return None
+        logger.warning(f"No suitable matches found for video ID '{primary_id}'")
+        return None
 
     async def download_assets(
         self, match_result: MatchResult, output_dir: Path
@@ -377,43 +580,38 @@ class VideoMatcher:
         if not self.config.plex_output.download_assets:
             return []
 
-        downloaded = []
-        async with ScraperAPIClient(self.config) as client:
-            # Download poster
-            if (
-                match_result.api_response
-                and "poster" in self.config.plex_output.asset_types
-                and match_result.api_response.get("poster_url")
-            ):
-                folder_jpg_path = output_dir / "folder.jpg"
-                if await client.download_asset(
-                    match_result.api_response["poster_url"], folder_jpg_path
-                ):
-                    downloaded.append("folder.jpg")
-
-            # Download fanart
-            if (
-                match_result.api_response
-                and "fanart" in self.config.plex_output.asset_types
-                and match_result.api_response.get("fanart_url")
-            ):
-                fanart_path = output_dir / "fanart.jpg"
-                if await client.download_asset(
-                    match_result.api_response["fanart_url"], fanart_path
-                ):
-                    downloaded.append("fanart.jpg")
-
-            # Download thumbnail if no poster available
-            if (
-                match_result.api_response
-                and match_result.api_response.get("thumbnail_url")
-                and match_result.api_response["thumbnail_url"].strip()
-                and not match_result.api_response.get("poster_url")
-            ):
-                folder_jpg_path = output_dir / "folder.jpg"
-                if await client.download_asset(
-                    match_result.api_response["thumbnail_url"], folder_jpg_path
-                ):
-                    downloaded.append("folder.jpg")
-
-        return downloaded
+        api_response = match_result.api_response
+        if not api_response:
+            return []
+
+        asset_types = self.config.plex_output.asset_types
+        assets: list[tuple[str, str]] = []  # (url, file name)
+
+        # Poster
+        if "poster" in asset_types and api_response.get("poster_url"):
+            assets.append((api_response["poster_url"], "folder.jpg"))
+
+        # Fanart
+        if "fanart" in asset_types and api_response.get("fanart_url"):
+            assets.append((api_response["fanart_url"], "fanart.jpg"))
+
+        # Thumbnail if no poster available
+        thumbnail_url = api_response.get("thumbnail_url")
+        if (
+            thumbnail_url
+            and thumbnail_url.strip()
+            and not api_response.get("poster_url")
+        ):
+            assets.append((thumbnail_url, "folder.jpg"))
+
+        # Independent transfers share the keep-alive pool, so run them together
+        base_dir = os.fspath(output_dir)
+        results = await asyncio.gather(
+            *(
+                self._client.download_asset(url, os.path.join(base_dir, name))
+                for url, name in assets
+            ),
+            return_exceptions=True,
+        )
+
+        return [name for (_, name), ok in zip(assets, results) if ok is True]
@@ -140,10 +140,16 @@ def main(
                 f"\nDRY RUN: Planning processing for {len(video_groups)} group(s)..."
             )
 
-        # Run async processing
-        results = asyncio.run(
-            processor.process_groups(video_groups, output_path, dry_run)
-        )
+        # Run async processing, closing pooled API connections afterwards
+        async def run_pipeline():
+            try:
+                return await processor.process_groups(
+                    video_groups, output_path, dry_run
+                )
+            finally:
+                await processor.close()
+
+        results = asyncio.run(run_pipeline())
 
         # Display results
         click.echo(f"\n{'=' * 60}")
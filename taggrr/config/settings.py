@@ -1,9 +1,23 @@
 """Configuration management for Taggerr."""
 
+import hashlib
+import json
+import os
+import re
 from pathlib import Path
+from typing import Any
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+try:
+    import msgspec
+except ImportError:  # Optional: JSON snapshots are used instead
+    msgspec = None
+
+# Prefer the libyaml-backed C loader/dumper; fall back to pure Python
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAMLDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class PatternConfig(BaseModel):
@@ -14,6 +28,22 @@ class PatternConfig(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0)
     source: str | None = None
 
+    _compiled: re.Pattern[str] | re.error = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        """Compile the regex once, when the pattern is validated."""
+        try:
+            self._compiled = re.compile(self.regex, re.IGNORECASE)
+        except re.error as e:
+            self._compiled = e
+
+    @property
+    def compiled(self) -> re.Pattern[str]:
+        """Case-insensitive compiled regex; raises re.error if invalid."""
+        if isinstance(self._compiled, re.error):
+            raise self._compiled
+        return self._compiled
+
 
 class SourcePatternConfig(BaseModel):
     """Source detection patterns for a specific source."""
@@ -66,18 +96,13 @@ class IDExtractionConfig(BaseModel):
 
     strong_patterns: list[PatternConfig] = Field(
         default_factory=lambda: [
+            # Patterns match case-insensitively, so this also covers fc2-ppv-
             PatternConfig(
                 regex=r"FC2-PPV-(\d{6,8})",
                 format="FC2-PPV-{}",
                 confidence=0.95,
                 source="fc2",
             ),
-            PatternConfig(
-                regex=r"fc2-ppv-(\d{6,8})",
-                format="FC2-PPV-{}",
-                confidence=0.95,
-                source="fc2",
-            ),
             PatternConfig(
                 regex=r"FC2PPV-(\d{6,8})",
                 format="FC2-PPV-{}",
@@ -155,9 +180,14 @@ class APIConfig(BaseModel):
     """API configuration."""
 
     base_url: str = "http://localhost:8000"
-    timeout: int = 30
-    retries: int = 3
-    retry_delay: float = 1.0
+    timeout: int = Field(default=30, gt=0)
+    retries: int = Field(default=3, ge=0)
+    retry_delay: float = Field(default=1.0, ge=0.0)
+    max_concurrency: int = Field(default=20, ge=1)  # In-flight batch requests
+    batch_threshold: int = Field(default=0, ge=0)  # Min IDs for batch POST; 0=off
+    circuit_failure_threshold: int = Field(default=5, ge=1)  # Consecutive 5xx
+    circuit_reset_timeout: float = Field(default=30.0, ge=0.0)  # Seconds open
+    http2: bool = False  # Multiplex over one connection; needs httpx[http2]
 
 
 class MatchingConfig(BaseModel):
@@ -209,27 +239,47 @@ class ConfigManager:
 
     DEFAULT_CONFIG_NAME = "taggerr.yaml"
 
+    # Parsed-config snapshots live in the user cache, not beside the YAML
+    SNAPSHOT_DIR = Path.home() / ".cache" / "taggerr" / "config"
+
+    # Parsed configs by path, tagged with the (mtime_ns, size) they were read at
+    _parse_cache: dict[str, tuple[tuple[int, int], TaggerrConfig]] = {}
+
     def __init__(self, config_path: Path | None = None):
         """Initialize config manager."""
         self.config_path = config_path or self._get_default_config_path()
         self._config: TaggerrConfig | None = None
+        self._raw_data: dict | None = None  # Settings as last read/written
 
     def load(self) -> TaggerrConfig:
         """Load configuration from file or create default."""
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
+        try:
+            # Binary mode: the C loader decodes UTF-8 itself
+            with open(self.config_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                key = (stat.st_mtime_ns, stat.st_size)
+                cached = self._parse_cache.get(str(self.config_path))
+                if cached is not None and cached[0] == key:
+                    self._config = cached[1].model_copy(deep=True)
+                    return self._config
+
+                # Fall back to parsing YAML when no snapshot matches the file
+                self._raw_data = None
+                self._config = self._load_snapshot(key)
+                if self._config is None:
+                    data = yaml.load(f, Loader=_YAMLLoader)
                     self._config = TaggerrConfig(**data)
-            except Exception as e:
-                print(f"Error loading config from {self.config_path}: {e}")
-                print("Using default configuration")
-                self._config = TaggerrConfig()
-        else:
+                    self._raw_data = data
+            self._remember(self._config, key)
+        except FileNotFoundError:
             print(f"Config file not found at {self.config_path}")
             print("Creating default configuration")
             self._config = TaggerrConfig()
             self.save()
+        except Exception as e:
+            print(f"Error loading config from {self.config_path}: {e}")
+            print("Using default configuration")
+            self._config = TaggerrConfig()
 
         return self._config
 
@@ -239,15 +289,48 @@ class ConfigManager:
         if config_to_save is None:
             raise ValueError("No configuration to save")
 
+        # Convert to dict and save as YAML
+        self._write(config_to_save.model_dump(), config_to_save)
+
+        print(f"Configuration saved to {self.config_path}")
+
+    def update_field(self, dotted_path: str, value: Any) -> None:
+        """Set one setting (e.g. ``"api.base_url"``) and save it.
+
+        Only the changed field is validated, and the file is rewritten from
+        the settings as last read or written plus this change, rather than
+        from a full dump of the model.
+        """
+        config = self.get_config()
+        *parents, leaf = dotted_path.split(".")
+
+        target = config
+        for name in parents:
+            target = getattr(target, name)
+        type(target).__pydantic_validator__.validate_assignment(target, leaf, value)
+
+        data = self._raw_data if self._raw_data is not None else config.model_dump()
+        node = data
+        for name in parents:
+            node = node.setdefault(name, {})
+        new_value = getattr(target, leaf)
+        if isinstance(new_value, BaseModel):
+            new_value = new_value.model_dump()
+        node[leaf] = new_value
+
+        self._write(data, config)
+
+    def _write(self, data: dict, config: TaggerrConfig) -> None:
+        """Write settings to the YAML file and refresh the load caches."""
         # Ensure directory exists
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Convert to dict and save as YAML
-        data = config_to_save.model_dump()
         with open(self.config_path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False, indent=2)
+            yaml.dump(data, f, Dumper=_YAMLDumper, default_flow_style=False, indent=2)
+        self._raw_data = data
 
-        print(f"Configuration saved to {self.config_path}")
+        key = self._remember(config)
+        self._write_snapshot(key, config)
 
     def get_config(self) -> TaggerrConfig:
         """Get current configuration, loading if necessary."""
@@ -267,6 +350,54 @@ class ConfigManager:
 
         self.save()
 
+    def _stat_key(self) -> tuple[int, int]:
+        """Return (mtime_ns, size) identifying the config file's contents."""
+        stat = self.config_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _remember(
+        self, config: TaggerrConfig, key: tuple[int, int] | None = None
+    ) -> tuple[int, int]:
+        """Cache a private copy of config for the file as it is now."""
+        if key is None:
+            key = self._stat_key()
+        self._parse_cache[str(self.config_path)] = (key, config.model_copy(deep=True))
+        return key
+
+    @property
+    def _snapshot_path(self) -> Path:
+        """Path of the parsed-config snapshot for this config file."""
+        digest = hashlib.sha256(os.fsencode(self.config_path.resolve())).hexdigest()
+        return self.SNAPSHOT_DIR / f"{self.config_path.name}-{digest[:16]}.cache"
+
+    def _load_snapshot(self, key: tuple[int, int]) -> TaggerrConfig | None:
+        """Return the config snapshot written by save() if it matches key."""
+        try:
+            payload = self._snapshot_path.read_bytes()
+            if msgspec is not None:
+                snapshot = msgspec.msgpack.decode(payload)
+            else:
+                snapshot = json.loads(payload)
+            if tuple(snapshot["key"]) != key:
+                return None
+            return TaggerrConfig.model_validate(snapshot["data"])
+        except Exception:
+            return None
+
+    def _write_snapshot(self, key: tuple[int, int], config: TaggerrConfig) -> None:
+        """Snapshot the validated config so the next load can skip YAML."""
+        snapshot = {"key": list(key), "data": config.model_dump(mode="json")}
+        try:
+            if msgspec is not None:
+                payload = msgspec.msgpack.encode(snapshot)
+            else:
+                payload = json.dumps(snapshot, separators=(",", ":")).encode()
+            path = self._snapshot_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(payload)
+        except Exception:
+            pass  # The snapshot is only a load-time shortcut
+
     def _get_default_config_path(self) -> Path:
         """Get default configuration file path."""
         # Look for config in current directory first, then user config dir
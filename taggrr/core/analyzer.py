@@ -2,6 +2,12 @@
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
+
+try:  # Optional Aho-Corasick automaton for provider markers
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 from .models import SourceHint, SourceType, VideoFile
 
@@ -23,32 +29,48 @@ class AnalysisResult:
 class IDExtractor:
     """Extracts video IDs from text using pattern matching."""
 
-    # Strong ID patterns with high confidence
+    # Strong ID patterns with high confidence. The last element lists
+    # lowercase markers the text must contain for the pattern to match.
     STRONG_PATTERNS = [
         (
             r"FC2-PPV-(\d{6,8})",
             "{}",
             SourceType.FC2,
             0.95,
+            ("fc2-ppv-",),
         ),  # Extract just the number for FC2 API
-        (r"fc2-ppv-(\d{6,8})", "{}", SourceType.FC2, 0.95),
-        (r"FC2PPV-(\d{6,8})", "{}", SourceType.FC2, 0.90),
-        (r"ppv-(\d{6,8})", "{}", SourceType.FC2, 0.80),
+        (r"fc2-ppv-(\d{6,8})", "{}", SourceType.FC2, 0.95, ("fc2-ppv-",)),
+        (r"FC2PPV-(\d{6,8})", "{}", SourceType.FC2, 0.90, ("fc2ppv-",)),
+        (r"ppv-(\d{6,8})", "{}", SourceType.FC2, 0.80, ("ppv-",)),
         # 1Pondo / 1pon date IDs (e.g. 102116_410, 100915_3257)
-        (r"(?:1pondo|1pon)[-_\s]*(\d{6}_\d{3,4})", "{}", SourceType.GENERIC, 0.92),
-        (r"(\d{6}_\d{3,4})[-_\s]*(?:1pondo|1pon)", "{}", SourceType.GENERIC, 0.92),
+        (
+            r"(?:1pondo|1pon)[-_\s]*(\d{6}_\d{3,4})",
+            "{}",
+            SourceType.GENERIC,
+            0.92,
+            ("1pon",),
+        ),
+        (
+            r"(\d{6}_\d{3,4})[-_\s]*(?:1pondo|1pon)",
+            "{}",
+            SourceType.GENERIC,
+            0.92,
+            ("1pon",),
+        ),
         # Caribbean / CaribbeanPR / Carrib variants (e.g. 121616_005, 21418_003)
         (
             r"(?:carib(?:bean)?(?:pr)?|carrib(?:ean)?(?:pr)?)[-_\s]*(\d{5,6}_\d{3,4})",
             "{}",
             SourceType.GENERIC,
             0.90,
+            ("carib", "carrib"),
         ),
         (
             r"(\d{5,6}_\d{3,4})[-_\s]*(?:carib(?:bean)?(?:pr)?|carrib(?:ean)?(?:pr)?)",
             "{}",
             SourceType.GENERIC,
             0.90,
+            ("carib", "carrib"),
         ),
     ]
 
@@ -66,26 +88,51 @@ class IDExtractor:
         (r"([A-Z]+\d+)", "{}", SourceType.GENERIC, 0.50),  # ABC123
     ]
 
+    # Compiled once when the class is defined and shared by every instance
+    strong_patterns = tuple(
+        (re.compile(p, re.IGNORECASE), f, s, c, m) for p, f, s, c, m in STRONG_PATTERNS
+    )
+    medium_patterns = tuple(
+        (re.compile(p, re.IGNORECASE), f, s, c) for p, f, s, c in MEDIUM_PATTERNS
+    )
+    weak_patterns = tuple(
+        (re.compile(p, re.IGNORECASE), f, s, c) for p, f, s, c in WEAK_PATTERNS
+    )
+
     def __init__(self):
-        """Initialize with compiled patterns."""
-        self.strong_patterns = [
-            (re.compile(p, re.IGNORECASE), f, s, c)
-            for p, f, s, c in self.STRONG_PATTERNS
-        ]
-        self.medium_patterns = [
-            (re.compile(p, re.IGNORECASE), f, s, c)
-            for p, f, s, c in self.MEDIUM_PATTERNS
-        ]
-        self.weak_patterns = [
-            (re.compile(p, re.IGNORECASE), f, s, c) for p, f, s, c in self.WEAK_PATTERNS
-        ]
+        """Initialize the provider-marker automaton."""
+        # One pass over the text finds every marker; strong patterns whose
+        # markers are absent cannot match and are skipped.
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for *_, markers in self.STRONG_PATTERNS:
+                for marker in markers:
+                    self._automaton.add_word(marker, marker)
+            self._automaton.make_automaton()
+        # Source and target copies usually share a file name, so results
+        # are memoized per text; tuples keep callers from mutating the cache
+        self._extract_cached = lru_cache(maxsize=4096)(self._extract_ids)
 
     def extract_ids(self, text: str) -> list[tuple[str, SourceType, float]]:
         """Extract all possible IDs from text with confidence scores."""
+        return list(self._extract_cached(text))
+
+    def _extract_ids(self, text: str) -> tuple[tuple[str, SourceType, float], ...]:
         ids = []
 
+        lowered = text.lower()
+        found = None
+        if self._automaton is not None:
+            found = {marker for _, marker in self._automaton.iter(lowered)}
+
         # Try strong patterns first
-        for pattern, format_str, source, confidence in self.strong_patterns:
+        for pattern, format_str, source, confidence, markers in self.strong_patterns:
+            if found is not None:
+                if found.isdisjoint(markers):
+                    continue
+            elif not any(marker in lowered for marker in markers):
+                continue
             matches = pattern.findall(text)
             for match in matches:
                 formatted_id = format_str.format(match)
@@ -115,7 +162,7 @@ class IDExtractor:
                 seen.add(id_tuple[0])
                 unique_ids.append(id_tuple)
 
-        return unique_ids
+        return tuple(unique_ids)
 
 
 class SourceDetector:
@@ -141,14 +188,14 @@ class SourceDetector:
         ],
     }
 
-    def __init__(self):
-        """Initialize with compiled patterns."""
-        self.compiled_patterns = {}
-        for source_type, patterns in self.SOURCE_PATTERNS.items():
-            self.compiled_patterns[source_type] = [
-                (re.compile(pattern, re.IGNORECASE), matched_text, boost)
-                for pattern, matched_text, boost in patterns
-            ]
+    # Compiled once when the class is defined and shared by every instance
+    compiled_patterns = {
+        source_type: tuple(
+            (re.compile(pattern, re.IGNORECASE), matched_text, boost)
+            for pattern, matched_text, boost in patterns
+        )
+        for source_type, patterns in SOURCE_PATTERNS.items()
+    }
 
     def detect_sources(self, text: str) -> list[SourceHint]:
         """Detect source hints from text."""
@@ -3,9 +3,59 @@
 import re
 from dataclasses import dataclass
 
+try:  # Optional Aho-Corasick automaton for literal source markers
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:  # Regex parser, used to find literal text a pattern requires
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
 from ..config.settings import PatternConfig, TaggerrConfig
 from .models import SourceHint, SourceType, VideoFile
 
+# Characters that make a glob (minus its "*" wildcards) more than plain text
+_REGEX_META = re.compile(r"[.^$+?{}\[\]\\|()]")
+
+# Backreferences / conditional groups, whose numbering breaks inside a union
+_GROUP_REF = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+# Shortest plain-text run worth checking with `in` before running a regex
+_MIN_REQUIRED_LITERAL = 3
+
+
+def _required_literal(pattern: re.Pattern[str]) -> str | None:
+    """Return the longest lowercase ASCII text every match must contain.
+
+    Only literals in the pattern's top-level sequence (including plain
+    groups) count; anything optional, repeated or alternated ends a run.
+    Returns None when no run of ``_MIN_REQUIRED_LITERAL`` characters exists.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+
+    runs = [""]
+
+    def walk(items) -> None:
+        for op, av in items:
+            if op == _sre_parse.LITERAL and av < 128:
+                runs[-1] += chr(av)
+            elif op == _sre_parse.SUBPATTERN:
+                walk(av[-1])
+            else:
+                runs.append("")
+
+    walk(parsed)
+    longest = max(runs, key=len)
+    if len(longest) < _MIN_REQUIRED_LITERAL:
+        return None
+    return longest.lower()
+
 
 @dataclass
 class AnalysisResult:
@@ -41,12 +91,38 @@ class ConfigurableIDExtractor:
             self.config.id_extraction.weak_patterns
         )
 
+        # Tiers are tried in order; each carries a fused prefilter regex
+        self._tiers = [
+            (patterns, self._build_union(patterns))
+            for patterns in (
+                self.strong_patterns,
+                self.medium_patterns,
+                self.weak_patterns,
+            )
+        ]
+
+    @staticmethod
+    def _build_union(patterns: list[tuple]) -> re.Pattern[str] | None:
+        """Fuse a tier into one alternation that rejects non-matching text.
+
+        Returns None (no prefilter) when fusing could change what matches:
+        group references are renumbered inside the union, and patterns that
+        cannot share one regex (e.g. duplicate group names) fail to compile.
+        """
+        sources = [pattern.pattern for pattern, *_ in patterns]
+        if not sources or any(_GROUP_REF.search(src) for src in sources):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{src})" for src in sources), re.IGNORECASE)
+        except re.error:
+            return None
+
     def _compile_pattern_list(self, patterns: list[PatternConfig]) -> list[tuple]:
         """Compile a list of pattern configurations."""
         compiled = []
         for pattern_config in patterns:
             try:
-                regex = re.compile(pattern_config.regex, re.IGNORECASE)
+                regex = pattern_config.compiled
                 source_type = self._get_source_type(pattern_config.source)
                 compiled.append(
                     (
@@ -54,6 +130,7 @@ class ConfigurableIDExtractor:
                         pattern_config.format,
                         source_type,
                         pattern_config.confidence,
+                        _required_literal(regex),
                     )
                 )
             except re.error as e:
@@ -75,30 +152,20 @@ class ConfigurableIDExtractor:
 
     def extract_ids(self, text: str) -> list[tuple[str, SourceType, float]]:
         """Extract all possible IDs from text with confidence scores."""
+        # Strong patterns first, then medium, then weak
         ids = []
-
-        # Try strong patterns first
-        for pattern, format_str, source, confidence in self.strong_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                formatted_id = format_str.format(match)
-                ids.append((formatted_id, source, confidence))
-
-        # If no strong matches, try medium patterns
-        if not ids:
-            for pattern, format_str, source, confidence in self.medium_patterns:
-                matches = pattern.findall(text)
-                for match in matches:
-                    formatted_id = format_str.format(match)
-                    ids.append((formatted_id, source, confidence))
-
-        # If still no matches, try weak patterns
-        if not ids:
-            for pattern, format_str, source, confidence in self.weak_patterns:
-                matches = pattern.findall(text)
-                for match in matches:
-                    formatted_id = format_str.format(match)
-                    ids.append((formatted_id, source, confidence))
+        lowered = text.lower()
+        for patterns, union in self._tiers:
+            # One scan of the fused regex skips tiers that cannot match
+            if union is not None and union.search(text) is None:
+                continue
+            for pattern, format_str, source, confidence, required in patterns:
+                if required is not None and required not in lowered:
+                    continue
+                for match in pattern.findall(text):
+                    ids.append((format_str.format(match), source, confidence))
+            if ids:
+                break
 
         # Remove duplicates while preserving order
         seen = set()
@@ -112,7 +179,11 @@ class ConfigurableIDExtractor:
 
 
 class ConfigurableSourceDetector:
-    """Detects source hints using configurable patterns."""
+    """Detects source hints using configurable patterns.
+
+    All state is built in ``__init__``; ``detect_sources`` only reads it, so
+    one instance can be shared across callers.
+    """
 
     def __init__(self, config: TaggerrConfig):
         """Initialize with configuration."""
@@ -120,41 +191,63 @@ class ConfigurableSourceDetector:
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
-        """Compile source detection patterns from configuration."""
+        """Compile source detection patterns from configuration.
+
+        Globs that are plain text with ``*`` wildcards only at the ends
+        reduce to a case-insensitive substring test; the rest need a regex.
+        """
         self.compiled_patterns = {}
+        literals = set()
 
         for source_name, source_config in self.config.source_detection.patterns.items():
             source_type = self._get_source_type(source_name)
             patterns = []
 
-            # Compile folder patterns
-            for pattern_str in source_config.folder:
-                try:
-                    # Convert glob pattern to regex
-                    regex_pattern = pattern_str.replace("*", ".*")
-                    regex = re.compile(regex_pattern, re.IGNORECASE)
+            for kind, globs in (
+                ("folder", source_config.folder),
+                ("file", source_config.file),
+            ):
+                for pattern_str in globs:
+                    # Only wildcards at the ends reduce to a substring test;
+                    # an interior "*" still has to span text between parts
+                    literal = pattern_str.strip("*")
+                    if "*" in literal or _REGEX_META.search(literal):
+                        literal = None
+                    try:
+                        # Convert glob pattern to regex
+                        regex_pattern = pattern_str.replace("*", ".*")
+                        regex = re.compile(regex_pattern, re.IGNORECASE)
+                    except re.error as e:
+                        print(f"Invalid {kind} pattern '{pattern_str}': {e}")
+                        continue
+
+                    required = None
+                    if literal is not None:
+                        literal = literal.lower()
+                        literals.add(literal)
+                    else:
+                        required = _required_literal(regex)
                     patterns.append(
-                        (regex, f"folder:{pattern_str}", source_config.confidence_boost)
+                        (
+                            regex,
+                            literal,
+                            required,
+                            f"{kind}:{pattern_str}",
+                            source_config.confidence_boost,
+                        )
                     )
-                except re.error as e:
-                    print(f"Invalid folder pattern '{pattern_str}': {e}")
-                    continue
-
-            # Compile file patterns
-            for pattern_str in source_config.file:
-                try:
-                    # Convert glob pattern to regex
-                    regex_pattern = pattern_str.replace("*", ".*")
-                    regex = re.compile(regex_pattern, re.IGNORECASE)
-                    patterns.append(
-                        (regex, f"file:{pattern_str}", source_config.confidence_boost)
-                    )
-                except re.error as e:
-                    print(f"Invalid file pattern '{pattern_str}': {e}")
-                    continue
 
             self.compiled_patterns[source_type] = patterns
 
+        # One automaton finds every literal marker in a single pass
+        self._automaton = None
+        literals.discard("")
+        if ahocorasick is not None and literals:
+            self._automaton = ahocorasick.Automaton()
+            for literal in literals:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
     def _get_source_type(self, source_str: str) -> SourceType:
         """Convert source string to SourceType enum."""
         source_map = {
@@ -167,10 +260,22 @@ class ConfigurableSourceDetector:
     def detect_sources(self, text: str) -> list[SourceHint]:
         """Detect source hints from text."""
         hints = []
+        lowered = text.lower()
+        found = None
+        if self._automaton is not None:
+            found = {literal for _, literal in self._automaton.iter(lowered)}
 
         for source_type, patterns in self.compiled_patterns.items():
-            for pattern, matched_text, boost in patterns:
-                if pattern.search(text):
+            for pattern, literal, required, matched_text, boost in patterns:
+                if literal is None:
+                    matched = (
+                        required is None or required in lowered
+                    ) and pattern.search(text) is not None
+                elif found is not None:
+                    matched = not literal or literal in found
+                else:
+                    matched = literal in lowered
+                if matched:
                     hint = SourceHint(
                         source_type=source_type,
                         pattern_matched=matched_text,
@@ -1,14 +1,45 @@
 """Duplicate video file detection across multiple folders."""
 
 import hashlib
+import mmap
+import os
 import re
+import sys
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
 
 from taggrr.core.analyzer import IDExtractor
+from taggrr.core.hash_cache import HashCache
 from taggrr.core.models import SourceType, VideoFile
 from taggrr.core.scanner import VideoScanner
 
+try:
+    import blake3
+except ImportError:  # Optional: fall back to hashlib's SHA256
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # Optional: partial hashes fall back to SHA256
+    xxhash = None
+
+# Algorithm behind compute_hash, recorded with persistently cached digests
+HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+
+# Read size for the SHA256 fallback; large reads keep per-call overhead low
+HASH_CHUNK_SIZE = 1 << 20
+
+# Bytes compute_partial_hash samples at the start, middle and end of a file
+PARTIAL_HASH_SAMPLE = 64 * 1024
+
+# Drops "-" and "_" and uppercases ASCII letters in one str.translate pass
+_NORMALIZE_ID_TABLE = {ord("-"): None, ord("_"): None} | {
+    c: c - 32 for c in range(ord("a"), ord("z") + 1)
+}
+
 
 @dataclass
 class DuplicateSet:
@@ -23,7 +54,7 @@ class DuplicateSet:
 
     # Content match fields (None for name-only sets)
     file_size: int | None
-    file_hash: str | None  # SHA256; populated when content_match is used
+    file_hash: str | None  # compute_hash digest; populated when content_match is used
 
     # Files grouped by their resolved parent directory
     files_by_dir: dict[Path, list[VideoFile]]
@@ -85,21 +116,35 @@ def _group_files_by_inode(files: list["VideoFile"]) -> list[list["VideoFile"]]:
     groups: dict[tuple[int, int], list[VideoFile]] = {}
     counter = 0
     for f in files:
-        try:
-            st = f.file_path.stat()
-            if st.st_ino != 0:
-                key: tuple[int, int] = (st.st_dev, st.st_ino)
-            else:
-                # Filesystem has no inode support — treat each path as unique.
-                key = (-1, counter)
-                counter += 1
-        except OSError:
-            key = (-2, counter)
+        key = _inode_key(f)
+        if key is None:
+            # Unstatable, or filesystem has no inode support — treat each
+            # path as unique.
+            key = (-1, counter)
             counter += 1
         groups.setdefault(key, []).append(f)
     return list(groups.values())
 
 
+def _inode_key(f: "VideoFile") -> tuple[int, int] | None:
+    """
+    Return (st_dev, st_ino) identifying a file's data on disk.
+
+    Uses the identity recorded by the scanner when present and only stats
+    the file otherwise. Returns None if the file cannot be stat-ed or its
+    filesystem does not expose inode numbers (st_ino == 0).
+    """
+    if f.st_dev is not None and f.st_ino is not None:
+        st_dev, st_ino = f.st_dev, f.st_ino
+    else:
+        try:
+            st = f.file_path.stat()
+        except OSError:
+            return None
+        st_dev, st_ino = st.st_dev, st.st_ino
+    return (st_dev, st_ino) if st_ino != 0 else None
+
+
 def are_hardlinks(path1: Path, path2: Path) -> bool:
     """
     Check if two paths point to the same underlying file (hardlinks).
@@ -121,24 +166,76 @@ def are_hardlinks(path1: Path, path2: Path) -> bool:
         return False
 
 
-def compute_hash(file_path: Path, chunk_size: int = 8192) -> str:
+def compute_hash(file_path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
     """
-    Calculate SHA256 hash of a file.
+    Calculate a 256-bit content hash of a file.
+
+    Uses BLAKE3 (memory-mapped, multithreaded) when the ``blake3`` package
+    is installed, otherwise SHA256. Digests are only compared within a
+    single scan, so either is fine as long as one is used throughout.
 
     Args:
         file_path: Path to the file
-        chunk_size: Read chunk size in bytes
+        chunk_size: Read chunk size in bytes, for files that cannot be
+            memory-mapped (SHA256 fallback only)
 
     Returns:
-        Hexadecimal SHA256 digest string
+        Hexadecimal digest string (64 characters)
     """
+    if blake3 is not None:
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.hexdigest()
+
+    # hashlib's OpenSSL backend already uses SHA extensions where the CPU has
+    # them; hash straight from a read-only mapping so no data is copied
     sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        while chunk := f.read(chunk_size):
-            sha256.update(chunk)
+    with open(file_path, "rb", buffering=0) as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # Empty or unmappable file
+            mapped = None
+
+        if mapped is not None:
+            with mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mapped) as view:
+                    sha256.update(view)
+            return sha256.hexdigest()
+
+        # Reuse one buffer so each read doesn't allocate a new bytes object
+        buffer = memoryview(bytearray(chunk_size))
+        while n := f.readinto(buffer):
+            sha256.update(buffer[:n])
     return sha256.hexdigest()
 
 
+def compute_partial_hash(file_path: Path, sample: int = PARTIAL_HASH_SAMPLE) -> str:
+    """
+    Hash the first, middle and last `sample` bytes of a file.
+
+    Same-size files whose partial hashes differ cannot be identical, so
+    content matching uses this to avoid reading most files in full. It only
+    groups candidates (compute_hash confirms them), so the non-cryptographic
+    xxh3_128 is used when the ``xxhash`` package is installed.
+
+    Args:
+        file_path: Path to the file
+        sample: Bytes read at each of the three offsets
+
+    Returns:
+        Hexadecimal digest string of the sampled bytes
+    """
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.sha256()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        for offset in (0, max(0, size // 2 - sample // 2), max(0, size - sample)):
+            f.seek(offset)
+            hasher.update(f.read(sample))
+    return hasher.hexdigest()
+
+
 class DuplicateDetector:
     """Detects duplicate video files across a source dir and multiple target dirs."""
 
@@ -149,9 +246,17 @@ class DuplicateDetector:
     ]
     _OPTION_PATTERN = re.compile(r"(?i)(?:^|[-_\s])option$")
 
-    def __init__(self) -> None:
+    def __init__(self, hash_cache: HashCache | None = None) -> None:
+        """
+        Initialize detector.
+
+        Args:
+            hash_cache: Optional persistent digest cache; when given, content
+                matching only re-hashes files whose inode, size or mtime changed.
+        """
         self.scanner = VideoScanner()
         self.id_extractor = IDExtractor()
+        self.hash_cache = hash_cache
 
     # ------------------------------------------------------------------
     # Public API
@@ -164,12 +269,13 @@ class DuplicateDetector:
         min_confidence: float = 0.5,
         content_match: bool = False,
         min_file_size_bytes: int = 0,
+        workers: int | None = None,
     ) -> list[DuplicateSet]:
         """
         Scan source + target directories and build duplicate sets.
 
         A duplicate set groups files that share the same normalized video ID
-        (name match) and/or the same SHA256 hash (content match). Each set
+        (name match) and/or the same content hash (content match). Each set
         carries a source_file pointer to the canonical copy in source_dir
         (or None if source has no representative in that set).
 
@@ -177,27 +283,47 @@ class DuplicateDetector:
             source_dir: The authoritative directory (files here are kept on fix).
             target_dirs: One or more directories to compare against.
             min_confidence: Minimum ID extraction confidence for name matching.
-            content_match: If True, also match files by size + SHA256 hash.
+            content_match: If True, also match files by size + content hash.
             min_file_size_bytes: Ignore files smaller than this size.
+            workers: Threads used to scan directories and hash content-match
+                candidates (default: min(8, CPU count); 1 runs serially).
 
         Returns:
             Sorted list of DuplicateSet objects.
         """
         all_dirs = [source_dir] + list(target_dirs)
 
-        # 1. Scan all directories
-        files_by_dir: dict[Path, list[VideoFile]] = {
-            d.resolve(): self.scanner.scan_directory(d) for d in all_dirs
-        }
-        if min_file_size_bytes > 0:
-            files_by_dir = {
-                d: [
+        if workers is None:
+            workers = min(8, os.cpu_count() or 1)
+
+        # 1. Scan all directories. Name matches need a source file, so without
+        #    content matching the source is scanned first and an empty one
+        #    ends the scan. The remaining walks are disjoint and I/O-bound, so
+        #    they run concurrently.
+        def scan(directory: Path) -> list[VideoFile]:
+            files = self.scanner.scan_directory(directory)
+            if min_file_size_bytes > 0:
+                files = [
                     f
                     for f in files
                     if f.file_size is not None and f.file_size >= min_file_size_bytes
                 ]
-                for d, files in files_by_dir.items()
-            }
+            return files
+
+        files_by_dir: dict[Path, list[VideoFile]] = {}
+        pending = all_dirs
+        if not content_match:
+            source_files = scan(source_dir)
+            if not source_files:
+                return []
+            files_by_dir[source_dir.resolve()] = source_files
+            pending = all_dirs[1:]
+        if workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                scanned = list(pool.map(scan, pending))
+        else:
+            scanned = [scan(d) for d in pending]
+        files_by_dir.update((d.resolve(), files) for d, files in zip(pending, scanned))
         source_dir_r = source_dir.resolve()
 
         # 2. Build id_maps per directory
@@ -214,6 +340,8 @@ class DuplicateDetector:
 
         # 3. Find IDs present in source AND at least one target
         source_id_map = id_maps[source_dir_r]
+        # Resolve the targets once rather than once per source ID
+        target_id_maps = [(d, id_maps[d]) for d in map(Path.resolve, target_dirs)]
         name_sets: list[DuplicateSet] = []
 
         for match_key, source_entries in source_id_map.items():
@@ -222,9 +350,10 @@ class DuplicateDetector:
             dir_entries: dict[Path, list[tuple[VideoFile, float, SourceType]]] = {
                 source_dir_r: source_entries
             }
-            for d in [d.resolve() for d in target_dirs]:
-                if match_key in id_maps[d]:
-                    dir_entries[d] = id_maps[d][match_key]
+            for d, id_map in target_id_maps:
+                target_entries = id_map.get(match_key)
+                if target_entries is not None:
+                    dir_entries[d] = target_entries
 
             if len(dir_entries) < 2:
                 # ID only in source; not a duplicate
@@ -278,12 +407,14 @@ class DuplicateDetector:
                     if f.file_path != dup_set.source_file.file_path
                 )
                 if all_same_size and source_size is not None:
-                    source_hash = compute_hash(dup_set.source_file.file_path)
+                    # Each inode chain is one copy of the data: hash one path
+                    # per chain, and none for the source's own hardlinks
+                    source_path = dup_set.source_file.file_path
+                    source_hash = self._hash(source_path)
                     all_same_hash = all(
-                        compute_hash(f.file_path) == source_hash
-                        for files in dup_set.files_by_dir.values()
-                        for f in files
-                        if f.file_path != dup_set.source_file.file_path
+                        self._hash(chain[0].file_path) == source_hash
+                        for chain in dup_set.inode_chains
+                        if all(f.file_path != source_path for f in chain)
                     )
                     if all_same_hash:
                         dup_set.match_type = "name+content"
@@ -298,20 +429,17 @@ class DuplicateDetector:
                 if f.file_path not in matched_paths
             ]
             content_sets = self._find_content_duplicates(
-                unmatched, files_by_dir, source_dir_r
+                unmatched, files_by_dir, source_dir_r, workers
             )
+            if self.hash_cache is not None:
+                self.hash_cache.flush()
 
-        all_sets = name_sets + content_sets
-
-        # 5. Sort: name/name+content by video_id, content-only by file_size
-        all_sets.sort(
-            key=lambda s: (
-                s.match_type == "content",  # name matches first
-                s.video_id or "",
-                s.file_size or 0,
-            )
-        )
-        return all_sets
+        # 5. Sort: name/name+content by video_id, content-only by file_size.
+        #    Name sets always have a unique video_id and content sets always
+        #    have a size, so each list sorts on one C-level attrgetter key.
+        name_sets.sort(key=attrgetter("video_id"))
+        content_sets.sort(key=attrgetter("file_size"))
+        return name_sets + content_sets
 
     # ------------------------------------------------------------------
     # Private helpers
@@ -370,7 +498,13 @@ class DuplicateDetector:
         Strips dashes and underscores and uppercases for all source types,
         so MIDE-123 == MIDE123 == mide_123.
         """
-        return video_id.upper().replace("-", "").replace("_", "")
+        normalized = video_id.translate(_NORMALIZE_ID_TABLE)
+        # The table only uppercases ASCII; str.isascii() is a flag check
+        if not normalized.isascii():
+            normalized = normalized.upper()
+        # Interned so every file with this ID shares one key object and
+        # cross-directory id_map lookups compare by identity
+        return sys.intern(normalized)
 
     def _build_set(
         self,
@@ -392,26 +526,33 @@ class DuplicateDetector:
 
         if source_file is not None:
             # Build pairs relative to source_file, skipping source dir (fix-mode use).
+            # The source's inode is looked up once rather than per pair.
+            source_key = _inode_key(source_file)
             for group_dir, files in files_by_dir.items():
                 if source_dir is not None and group_dir == source_dir:
                     continue
                 for f in files:
                     if f.file_path == source_file.file_path:
                         continue
-                    if are_hardlinks(source_file.file_path, f.file_path):
+                    if source_key is not None and _inode_key(f) == source_key:
                         hardlink_pairs.append((source_file, f))
                     else:
                         copy_pairs.append((source_file, f))
 
+            # Group by inode once; chains feed both wasted space and display.
+            raw_chains = _group_files_by_inode(all_files)
+
             # Wasted space: count one file-size per distinct copy inode.
             # Multiple paths in the same copy chain (hardlinked to each other but not
             # to source) share the same blocks — only one copy of the data is wasted.
-            copy_file_list = [f for _, f in copy_pairs]
-            copy_inode_groups = _group_files_by_inode(copy_file_list)
-            wasted_space = sum(grp[0].file_size or 0 for grp in copy_inode_groups)
+            copy_paths = {f.file_path for _, f in copy_pairs}
+            wasted_space = sum(
+                chain[0].file_size or 0
+                for chain in raw_chains
+                if any(f.file_path in copy_paths for f in chain)
+            )
 
             # Build inode_chains for display: source's chain first, copy chains after.
-            raw_chains = _group_files_by_inode(all_files)
             raw_chains = [sorted(c, key=lambda f: str(f.file_path)) for c in raw_chains]
             src_idx = next(
                 (
@@ -453,11 +594,44 @@ class DuplicateDetector:
             wasted_space=wasted_space,
         )
 
+    def _hash(self, file_path: Path) -> str:
+        """Content hash of file_path, via the hash cache when one is set."""
+        if self.hash_cache is None:
+            return compute_hash(file_path)
+        return self.hash_cache.get_or_compute(file_path, compute_hash, HASH_ALGORITHM)
+
+    def _hash_files(
+        self,
+        paths: list[Path],
+        workers: int,
+        hasher: Callable[[Path], str] | None = None,
+    ) -> dict[Path, str]:
+        """Hash paths on up to `workers` threads; unreadable files are omitted.
+
+        Uses the full content hash (self._hash) unless another hasher is given.
+        """
+        hasher = hasher or self._hash
+
+        def hash_or_none(path: Path) -> str | None:
+            try:
+                return hasher(path)
+            except OSError:
+                return None
+
+        if workers > 1 and len(paths) > 1:
+            # hashlib and blake3 release the GIL while hashing
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(hash_or_none, paths))
+        else:
+            results = [hash_or_none(p) for p in paths]
+        return {p: h for p, h in zip(paths, results) if h is not None}
+
     def _find_content_duplicates(
         self,
         files: list[VideoFile],
         files_by_dir: dict[Path, list[VideoFile]],
         source_dir: Path,
+        workers: int = 1,
     ) -> list[DuplicateSet]:
         """
         Group unmatched files by size then hash to find content duplicates.
@@ -477,7 +651,8 @@ class DuplicateDetector:
             if f.file_size is not None:
                 by_size.setdefault(f.file_size, []).append(f)
 
-        sets: list[DuplicateSet] = []
+        # Keep size buckets that could hold a cross-directory duplicate
+        buckets: list[tuple[int, list[VideoFile], list[list[VideoFile]]]] = []
         for size, size_group in by_size.items():
             if len(size_group) < 2:
                 continue
@@ -485,15 +660,47 @@ class DuplicateDetector:
             dirs_in_group = {path_to_dir.get(f.file_path) for f in size_group}
             if len(dirs_in_group) < 2:
                 continue
+            buckets.append((size, size_group, _group_files_by_inode(size_group)))
+
+        # Small files are hashed in full; larger ones first get a cheap
+        # first/middle/last sample hash, and only samples shared across
+        # directories go on to a full hash
+        to_hash: list[list[VideoFile]] = []
+        sampled: list[list[VideoFile]] = []
+        for size, _, groups in buckets:
+            if size > 3 * PARTIAL_HASH_SAMPLE:
+                sampled.extend(groups)
+            else:
+                to_hash.extend(groups)
 
-            # Hash all files in this size group
+        partials = self._hash_files(
+            [grp[0].file_path for grp in sampled], workers, compute_partial_hash
+        )
+        by_partial: dict[tuple[int | None, str], list[list[VideoFile]]] = {}
+        for grp in sampled:
+            partial = partials.get(grp[0].file_path)
+            if partial is not None:
+                by_partial.setdefault((grp[0].file_size, partial), []).append(grp)
+        for groups in by_partial.values():
+            dirs_here = {path_to_dir.get(f.file_path) for grp in groups for f in grp}
+            if len(dirs_here) >= 2:
+                to_hash.extend(groups)
+
+        # Hash one path per inode (in parallel); hardlinks share its digest
+        rep_digests = self._hash_files([grp[0].file_path for grp in to_hash], workers)
+        digests: dict[Path, str] = {
+            f.file_path: rep_digests[grp[0].file_path]
+            for grp in to_hash
+            if grp[0].file_path in rep_digests
+            for f in grp
+        }
+
+        sets: list[DuplicateSet] = []
+        for size, size_group, _ in buckets:
             hash_groups: dict[str, list[VideoFile]] = {}
             for f in size_group:
-                try:
-                    h = compute_hash(f.file_path)
-                    hash_groups.setdefault(h, []).append(f)
-                except OSError:
-                    pass
+                if f.file_path in digests:
+                    hash_groups.setdefault(digests[f.file_path], []).append(f)
 
             for file_hash, hash_group in hash_groups.items():
                 if len(hash_group) < 2:
@@ -532,7 +739,14 @@ class DuplicateDetector:
 
 
 def get_unmatched_files(
-    folder_files: list[VideoFile], matched_files: set[Path]
+    folder_files: list[VideoFile], matched_files: Iterable[Path]
 ) -> list[VideoFile]:
-    """Return files that weren't matched in duplicate detection."""
-    return [f for f in folder_files if f.file_path not in matched_files]
+    """
+    Return files that weren't matched in duplicate detection.
+
+    matched_files may be any iterable of paths. They are compared as the
+    strings they render to, so each membership test hashes and compares a
+    str rather than going through Path.__hash__/__eq__.
+    """
+    matched = frozenset(map(os.fspath, matched_files))
+    return [f for f in folder_files if os.fspath(f.file_path) not in matched]
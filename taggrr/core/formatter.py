@@ -1,7 +1,9 @@
 """Plex-compatible output formatting and file organization."""
 
 import logging
-import re
+import os
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
 from ..config.settings import TaggerrConfig
@@ -13,18 +15,18 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Conservative output folder length limit, below Windows' 260-char MAX_PATH
+MAX_OUTPUT_PATH_LENGTH = 250
+
 
 class PlexFormatter:
     """Formats file names and folder structures for Plex compatibility."""
 
-    def __init__(self, config: TaggerrConfig):
-        """Initialize formatter with configuration."""
-        self.config = config
-        self.plex_config = config.plex_output
-
-        # Characters that need to be sanitized for file systems
-        self.invalid_chars = re.compile(r'[<>:"/\\|?*]')
-        self.invalid_names = {
+    # Built once when the class is defined and shared by every instance.
+    # Invalid file-system characters map to "_" in one str.translate pass.
+    invalid_char_table = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+    invalid_names = frozenset(
+        {
             "CON",
             "PRN",
             "AUX",
@@ -48,21 +50,20 @@ class PlexFormatter:
             "LPT8",
             "LPT9",
         }
+    )
+
+    def __init__(self, config: TaggerrConfig):
+        """Initialize formatter with configuration."""
+        self.config = config
+        self.plex_config = config.plex_output
+        # Planning sanitizes the same composed names repeatedly (the folder
+        # name once per group and again per plan); the result depends only
+        # on the name, so it is memoized per formatter.
+        self._sanitize_cached = lru_cache(maxsize=1024)(self._sanitize_name)
 
     def format_folder_name(self, match_result: MatchResult) -> str:
         """Generate Plex-compatible folder name."""
-        title = match_result.video_metadata.get("title", "Unknown Title")
-        title = self._clean_title(title)
-        year = match_result.video_metadata.get("year")
-
-        # For FC2 content, use the video ID instead of long Japanese titles
-        # to avoid Windows path issues
-        if (
-            match_result.source.name == "FC2"
-            and match_result.video_id
-            and match_result.video_id.isdigit()
-        ):
-            title = f"FC2-PPV-{match_result.video_id}"
+        title, year = self._title_and_year(match_result)
 
         # Use configured format
         if year:
@@ -71,7 +72,7 @@ class PlexFormatter:
             # Fallback if no year available
             folder_name = title
 
-        return self._sanitize_name(folder_name)
+        return self._sanitize_cached(folder_name)
 
     def format_file_name(
         self,
@@ -80,18 +81,7 @@ class PlexFormatter:
         file_extension: str = ".mp4",
     ) -> str:
         """Generate Plex-compatible file name."""
-        title = match_result.video_metadata.get("title", "Unknown Title")
-        title = self._clean_title(title)
-        year = match_result.video_metadata.get("year")
-
-        # For FC2 content, use the video ID instead of long Japanese titles
-        # to avoid Windows path issues
-        if (
-            match_result.source.name == "FC2"
-            and match_result.video_id
-            and match_result.video_id.isdigit()
-        ):
-            title = f"FC2-PPV-{match_result.video_id}"
+        title, year = self._title_and_year(match_result)
 
         if part_info:
             # Multi-part file
@@ -110,7 +100,7 @@ class PlexFormatter:
             else:
                 file_name = title
 
-        sanitized_name = self._sanitize_name(file_name)
+        sanitized_name = self._sanitize_cached(file_name)
         return f"{sanitized_name}{file_extension}"
 
     def format_group_structure(
@@ -139,6 +129,23 @@ class PlexFormatter:
 
         return structure
 
+    def _title_and_year(self, match_result: MatchResult) -> tuple[str, int | None]:
+        """Return the display title and year used by the name formats."""
+        title = match_result.video_metadata.get("title", "Unknown Title")
+        title = self._clean_title(title)
+        year = match_result.video_metadata.get("year")
+
+        # For FC2 content, use the video ID instead of long Japanese titles
+        # to avoid Windows path issues
+        if (
+            match_result.source.name == "FC2"
+            and match_result.video_id
+            and match_result.video_id.isdigit()
+        ):
+            title = f"FC2-PPV-{match_result.video_id}"
+
+        return title, year
+
     def _get_part_info(self, video_file) -> str:
         """Extract part information from video file."""
         if video_file.detected_parts:
@@ -160,7 +167,7 @@ class PlexFormatter:
     def _sanitize_name(self, name: str) -> str:
         """Sanitize name for file system compatibility."""
         # Remove/replace invalid characters
-        sanitized = self.invalid_chars.sub("_", name)
+        sanitized = name.translate(self.invalid_char_table)
 
         # Remove leading/trailing whitespace and dots
         sanitized = sanitized.strip(" .")
@@ -297,18 +304,16 @@ class NFOGenerator:
         if not isinstance(text, str):
             text = str(text)
 
-        replacements = {
-            "&": "&amp;",
-            "<": "&lt;",
-            ">": "&gt;",
-            '"': "&quot;",
-            "'": "&#39;",
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+        # "&" first so the entities added below are not escaped again. Each
+        # replace is a C-level scan that returns text itself when nothing
+        # matches, which is the common case for titles and names.
+        return (
+            text.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+            .replace("'", "&#39;")
+        )
 
 
 class OutputPlanner:
@@ -331,28 +336,26 @@ class OutputPlanner:
         file_mapping = self.formatter.format_group_structure(video_group, match_result)
 
         # Calculate output paths
-        output_structure = {}
         folder_name = self.formatter.format_folder_name(match_result)
         output_folder = output_base_dir / folder_name
 
-        # Plan file moves/copies based on processing mode
-        for source_path, relative_path in file_mapping.items():
-            source = Path(source_path)
-            target = output_base_dir / relative_path
-
-            # Determine action based on processing mode
-            if self.processing_mode == ProcessingMode.HARDLINK:
-                action = "hardlink"
-            elif self.processing_mode == ProcessingMode.INPLACE:
-                action = "move"
-            else:
-                action = "copy"  # fallback
+        # Determine action based on processing mode (same for every file)
+        if self.processing_mode == ProcessingMode.HARDLINK:
+            action = "hardlink"
+        elif self.processing_mode == ProcessingMode.INPLACE:
+            action = "move"
+        else:
+            action = "copy"  # fallback
 
-            output_structure[str(source)] = {
-                "target_path": target,
+        # Plan file moves/copies; file_mapping is already keyed by str(path)
+        output_structure = {
+            source_path: {
+                "target_path": output_base_dir / relative_path,
                 "relative_path": relative_path,
                 "action": action,
             }
+            for source_path, relative_path in file_mapping.items()
+        }
 
         # Plan NFO file creation
         nfo_content = self.nfo_generator.generate_movie_nfo(match_result)
@@ -404,9 +407,7 @@ class OutputPlanner:
             "output_folder": output_folder,
             "structure": output_structure,
             "folder_name": folder_name,
-            "total_files": len(
-                [k for k in output_structure.keys() if not k.startswith("_")]
-            ),
+            "total_files": len(file_mapping),
         }
 
     def validate_output_plan(self, plan: dict[str, any]) -> tuple[bool, list[str]]:
@@ -415,13 +416,14 @@ class OutputPlanner:
 
         # Check if output folder would be too deeply nested
         output_folder = plan["output_folder"]
-        if len(str(output_folder)) > 250:  # Conservative path length limit
+        if len(os.fspath(output_folder)) > MAX_OUTPUT_PATH_LENGTH:
             issues.append(f"Output path too long: {output_folder}")
 
-        # Check for potential conflicts
+        # Check for potential conflicts; os.fspath returns the path's cached
+        # string (and passes str targets through) without building a new one
         target_paths = set()
         for item in plan["structure"].values():
-            target_path = str(item["target_path"])
+            target_path = os.fspath(item["target_path"])
             if target_path in target_paths:
                 issues.append(f"Duplicate target path: {target_path}")
             target_paths.add(target_path)
@@ -445,25 +447,22 @@ class OutputPlanner:
 
         structure = plan["structure"]
 
-        # Count different action types
-        actions = {}
-        for item in structure.values():
-            action = item["action"]
-            actions[action] = actions.get(action, 0) + 1
+        # Count different action types in one C-level pass; missing ones are 0
+        actions = Counter(item["action"] for item in structure.values())
 
-        if actions.get("copy", 0) > 0:
+        if actions["copy"]:
             summary_parts.append(f"Files to copy: {actions['copy']}")
 
-        if actions.get("move", 0) > 0:
+        if actions["move"]:
             summary_parts.append(f"Files to move: {actions['move']}")
 
-        if actions.get("hardlink", 0) > 0:
+        if actions["hardlink"]:
             summary_parts.append(f"Files to hardlink: {actions['hardlink']}")
 
-        if actions.get("create", 0) > 0:
+        if actions["create"]:
             summary_parts.append(f"NFO files to create: {actions['create']}")
 
-        if actions.get("download", 0) > 0:
+        if actions["download"]:
             summary_parts.append(f"Assets to download: {actions['download']}")
 
         return " | ".join(summary_parts)
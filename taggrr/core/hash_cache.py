@@ -0,0 +1,112 @@
+"""Persistent cache of file content hashes keyed by inode and mtime."""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+DEFAULT_HASH_DB = Path.home() / ".cache" / "taggerr" / "hashdb.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    used_ns INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino)
+)
+"""
+
+
+class HashCache:
+    """Maps (st_dev, st_ino, st_size, st_mtime_ns) to a content digest.
+
+    A file is only re-hashed when its inode is new, its size or mtime
+    changed, or it was last hashed with a different algorithm. Writes are
+    buffered until flush(), so a whole scan is stored in one transaction;
+    the least recently used rows beyond max_entries are evicted at that
+    point.
+    """
+
+    def __init__(self, db_path: Path | None = None, max_entries: int = 2000):
+        """Open (creating if needed) the cache database.
+
+        Args:
+            db_path: SQLite file (default: ~/.cache/taggerr/hashdb.sqlite).
+            max_entries: Rows kept after each flush.
+        """
+        self.db_path = db_path or DEFAULT_HASH_DB
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by hashing threads; every access holds self._lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._pending: dict[tuple[int, int], tuple[int, int, str, str, int]] = {}
+
+    def get_or_compute(
+        self, file_path: Path, compute: Callable[[Path], str], algorithm: str
+    ) -> str:
+        """Return the cached digest for file_path, hashing it on a miss.
+
+        Args:
+            file_path: File to look up.
+            compute: Hash function used on a miss.
+            algorithm: Name of compute's algorithm; digests cached under
+                another name are not reused.
+        """
+        st = os.stat(file_path)
+        inode = (st.st_dev, st.st_ino)
+        version = (st.st_size, st.st_mtime_ns, algorithm)
+
+        with self._lock:
+            entry = self._pending.get(inode)
+            if entry is None:
+                entry = self._conn.execute(
+                    "SELECT size, mtime_ns, algorithm, digest FROM hashes "
+                    "WHERE dev = ? AND ino = ?",
+                    inode,
+                ).fetchone()
+        if entry is not None and tuple(entry[:3]) == version:
+            digest = entry[3]
+        else:
+            # Hash outside the lock so threads can hash concurrently
+            digest = compute(file_path)
+
+        with self._lock:
+            self._pending[inode] = (*version, digest, time.time_ns())
+        return digest
+
+    def flush(self) -> None:
+        """Write buffered entries and evict rows beyond max_entries."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(*inode, *entry) for inode, entry in self._pending.items()],
+                )
+                self._conn.execute(
+                    "DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes "
+                    "ORDER BY used_ns DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Flush pending entries and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -20,7 +20,7 @@ class SourceType(Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PartInfo:
     """Information about a video part."""
 
@@ -30,7 +30,7 @@ class PartInfo:
     file_path: Path
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceHint:
     """Source detection hint."""
 
@@ -39,7 +39,7 @@ class SourceHint:
     confidence_boost: float
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoFile:
     """Represents a video file with analysis metadata."""
 
@@ -49,6 +49,11 @@ class VideoFile:
     detected_parts: list[PartInfo] = field(default_factory=list)
     source_hints: list[SourceHint] = field(default_factory=list)
     file_size: int | None = None
+    # Stem with part indicators removed; a derived cache, not identity
+    clean_stem: str | None = field(default=None, compare=False, repr=False)
+    # Inode identity from the scan's stat; None when not scanned or unstatable
+    st_dev: int | None = field(default=None, compare=False, repr=False)
+    st_ino: int | None = field(default=None, compare=False, repr=False)
 
     @property
     def stem(self) -> str:
@@ -61,7 +66,7 @@ class VideoFile:
         return len(self.detected_parts) > 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoGroup:
     """Group of related video files (e.g., multi-part series)."""
 
@@ -79,7 +84,7 @@ class VideoGroup:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConfidenceBreakdown:
     """Detailed confidence scoring."""
 
@@ -89,7 +94,7 @@ class ConfidenceBreakdown:
     overall_confidence: float
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     """Result of matching a video against metadata APIs."""
 
@@ -101,7 +106,7 @@ class MatchResult:
     api_response: dict | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Result of processing a video file or group."""
 
@@ -113,7 +118,7 @@ class ProcessingResult:
     assets_downloaded: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlexMetadata:
     """Plex-compatible metadata structure."""
 
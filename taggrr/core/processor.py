@@ -32,6 +32,10 @@ class VideoProcessor:
             config, processing_mode=self.processing_mode
         )
 
+    async def close(self):
+        """Release the matcher's pooled HTTP connections."""
+        await self.matcher.close()
+
     async def process_groups(
         self, video_groups: list[VideoGroup], output_dir: Path, dry_run: bool = False
     ) -> list[ProcessingResult]:
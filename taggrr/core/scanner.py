@@ -1,83 +1,164 @@
 """File scanning and multi-part detection system."""
 
+import os
 import re
-from difflib import SequenceMatcher
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TypeVar
 
 from .models import PartInfo, VideoFile, VideoGroup
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _lcs_length(s1: str, s2: str) -> int:
+    """Length of the longest common subsequence (bit-parallel, Hyyrö 2004)."""
+    if not s1 or not s2:
+        return 0
+
+    # One bit per character of s1; each character of s2 advances every DP
+    # column cell at once using integer add/or on the packed bit vector.
+    masks: dict[str, int] = {}
+    for i, char in enumerate(s1):
+        masks[char] = masks.get(char, 0) | (1 << i)
+
+    full = (1 << len(s1)) - 1
+    row = full
+    for char in s2:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+
+    return len(s1) - row.bit_count()
+
+
+def _indel_similarity(s1: str, s2: str) -> float:
+    """Normalized Indel similarity: 2 * LCS / (len(s1) + len(s2))."""
+    total = len(s1) + len(s2)
+    if not total:
+        return 1.0
+
+    # Series names usually share a long prefix and differ only in the tail,
+    # so only the differing middle section needs the LCS computation.
+    prefix = len(os.path.commonprefix([s1, s2]))
+    tail1 = s1[prefix:]
+    tail2 = s2[prefix:]
+    suffix = len(os.path.commonprefix([tail1[::-1], tail2[::-1]]))
+    if suffix:
+        tail1 = tail1[:-suffix]
+        tail2 = tail2[:-suffix]
+
+    common = prefix + suffix + _lcs_length(tail1, tail2)
+    return 2 * common / total
+
+
+def _compile_part_patterns(
+    patterns: list[tuple[str, str]],
+) -> list[tuple[re.Pattern[str], str]]:
+    """Compile (regex, format) part patterns for PartDetector."""
+    return [
+        (re.compile(pattern, re.IGNORECASE | re.ASCII), format_str)
+        for pattern, format_str in patterns
+    ]
+
 
 class PartDetector:
     """Detects and groups multi-part video files."""
 
     DEFAULT_PATTERNS = [
-        (r"(?i)part[\s_]*(\d+)", "Part {n}"),
-        (r"(?i)cd[\s_]*(\d+)", "CD{n}"),
-        (r"(?i)disc[\s_]*(\d+)", "Disc {n}"),
-        (r"(?i)-(\d+)(?=\.\w+$|$)", "Part {n}"),
-        (r"(?i)_(\d+)(?=\.\w+$|$)", "Part {n}"),
-        (r"(?i)\[(\d+)\]", "Part {n}"),
-        (r"(?i)\((\d+)\)", "Part {n}"),
+        (r"part[\s_]*(\d+)", "Part {n}"),
+        (r"cd[\s_]*(\d+)", "CD{n}"),
+        (r"disc[\s_]*(\d+)", "Disc {n}"),
+        (r"-(\d+)(?=\.\w+$|$)", "Part {n}"),
+        (r"_(\d+)(?=\.\w+$|$)", "Part {n}"),
+        (r"\[(\d+)\]", "Part {n}"),
+        (r"\((\d+)\)", "Part {n}"),
     ]
 
+    # Shared by every detector using the defaults; compiled once
+    _DEFAULT_COMPILED = _compile_part_patterns(DEFAULT_PATTERNS)
+
+    # Part indicators sit at the end of the stem; only this many trailing
+    # characters are searched by detect_parts.
+    TAIL_WINDOW = 32
+
+    # ID patterns for _extract_video_id, which runs for every file pair in
+    # group_related_files; compiled once here rather than on each call.
+    _FC2_ID_PATTERNS = tuple(
+        re.compile(pattern, re.IGNORECASE)
+        for pattern in (
+            r"FC2-PPV-(\d{6,8})",
+            r"FC2PPV-(\d{6,8})",
+            r"ppv-(\d{6,8})",
+        )
+    )
+    _DMM_ID_PATTERNS = tuple(
+        re.compile(pattern)
+        for pattern in (
+            r"([A-Z]{2,5}-\d{3,4})",
+            r"([A-Z]{3,5}\d{3,4})",
+            r"(\d{6}_\d{3})",
+        )
+    )
+
     def __init__(self, patterns: list[tuple[str, str]] | None = None):
         """Initialize with custom patterns or defaults."""
         self.patterns = patterns or self.DEFAULT_PATTERNS
-        self.compiled_patterns = [
-            (re.compile(pattern), format_str) for pattern, format_str in self.patterns
-        ]
+        if self.patterns is self.DEFAULT_PATTERNS:
+            self.compiled_patterns = self._DEFAULT_COMPILED
+        else:
+            self.compiled_patterns = _compile_part_patterns(self.patterns)
 
     def detect_parts(self, file_path: Path) -> list[PartInfo]:
-        """Detect part information from filename."""
-        parts = []
-        filename = file_path.stem
-        found_part_numbers = set()
+        """Detect part information from the tail of the filename.
+
+        Patterns are ordered by specificity and callers only use the first
+        part, so detection stops at the first pattern that yields a number.
+        """
+        filename = file_path.stem[-self.TAIL_WINDOW :]
 
         for pattern, format_str in self.compiled_patterns:
-            matches = pattern.findall(filename)
-            for match in matches:
-                try:
-                    part_num = int(match)
-
-                    # Skip if we already found this part number
-                    if part_num in found_part_numbers:
-                        continue
-
-                    found_part_numbers.add(part_num)
-                    confidence = 0.9  # High confidence for explicit patterns
-
-                    part_info = PartInfo(
-                        part_number=part_num,
-                        part_pattern=format_str.replace("{n}", str(part_num)),
-                        confidence=confidence,
-                        file_path=file_path,
-                    )
-                    parts.append(part_info)
-                except ValueError:
-                    continue
+            match = pattern.search(filename)
+            if not match:
+                continue
+
+            try:
+                part_num = int(match.group(1) if pattern.groups else match.group())
+            except ValueError:
+                continue
+
+            return [
+                PartInfo(
+                    part_number=part_num,
+                    part_pattern=format_str.replace("{n}", str(part_num)),
+                    confidence=0.9,  # High confidence for explicit patterns
+                    file_path=file_path,
+                )
+            ]
 
-        return parts
+        return []
 
     def group_related_files(
         self, video_files: list[VideoFile], similarity_threshold: float = 0.8
     ) -> list[VideoGroup]:
         """Group files that belong to the same multi-part series."""
         groups = []
-        processed = set()
+        processed = bytearray(len(video_files))
 
         for i, file1 in enumerate(video_files):
-            if i in processed:
+            if processed[i]:
                 continue
 
             group_files = [file1]
-            processed.add(i)
+            processed[i] = 1
 
             # Extract video ID from the first file to ensure we don't mix different videos
             file1_id = self._extract_video_id(file1.stem)
 
             # Find similar files that might be parts
             for j, file2 in enumerate(video_files[i + 1 :], i + 1):
-                if j in processed:
+                if processed[j]:
                     continue
 
                 # First check if they have the same video ID - if different IDs, never group
@@ -85,7 +166,9 @@ class PartDetector:
                 if file1_id and file2_id and file1_id != file2_id:
                     continue  # Different video IDs, skip
 
-                similarity = self._calculate_similarity(file1.stem, file2.stem)
+                similarity = _indel_similarity(
+                    self._clean_stem(file1).lower(), self._clean_stem(file2).lower()
+                )
                 if similarity >= similarity_threshold:
                     # Check if both have part indicators or neither does
                     file1_has_parts = bool(file1.detected_parts)
@@ -93,13 +176,22 @@ class PartDetector:
 
                     if file1_has_parts or file2_has_parts:
                         group_files.append(file2)
-                        processed.add(j)
+                        processed[j] = 1
 
             # Create group
             if len(group_files) > 1 or any(f.detected_parts for f in group_files):
                 group_name = self._generate_group_name(group_files)
+
+                # Decorate-sort-undecorate on precomputed part numbers (files
+                # without parts count as part 1); the index keeps it stable.
+                part_numbers = [
+                    f.detected_parts[0].part_number if f.detected_parts else 1
+                    for f in group_files
+                ]
+                order = sorted(range(len(group_files)), key=part_numbers.__getitem__)
+
                 group = VideoGroup(
-                    files=sorted(group_files, key=self._get_part_number),
+                    files=[group_files[k] for k in order],
                     group_name=group_name,
                     total_parts=len(group_files),
                     folder_path=group_files[0].file_path.parent,
@@ -117,13 +209,11 @@ class PartDetector:
 
         return groups
 
-    def _calculate_similarity(self, name1: str, name2: str) -> float:
-        """Calculate similarity between two filenames."""
-        # Remove part indicators for comparison
-        clean_name1 = self._remove_part_indicators(name1)
-        clean_name2 = self._remove_part_indicators(name2)
-
-        return SequenceMatcher(None, clean_name1.lower(), clean_name2.lower()).ratio()
+    def _clean_stem(self, video_file: VideoFile) -> str:
+        """Return the file's stem without part indicators, cached on the file."""
+        if video_file.clean_stem is None:
+            video_file.clean_stem = self._remove_part_indicators(video_file.stem)
+        return video_file.clean_stem
 
     def _remove_part_indicators(self, filename: str) -> str:
         """Remove part indicators from filename for similarity comparison."""
@@ -137,8 +227,14 @@ class PartDetector:
         if not files:
             return ""
 
-        # Use the longest common substring approach
-        names = [self._remove_part_indicators(f.stem) for f in files]
+        names = [self._clean_stem(f) for f in files]
+
+        # Multi-part series almost always share their name as a prefix
+        prefix = os.path.commonprefix(names).strip()
+        if len(prefix) >= 3:
+            return prefix
+
+        # Fall back to the longest common substring approach
         base_name = names[0]
 
         for name in names[1:]:
@@ -147,41 +243,43 @@ class PartDetector:
         return base_name.strip()
 
     def _longest_common_substring(self, s1: str, s2: str) -> str:
-        """Find longest common substring."""
-        matcher = SequenceMatcher(None, s1, s2)
-        match = matcher.find_longest_match()
-        return s1[match.a : match.a + match.size]
+        """Find longest common substring (earliest in s1 on ties)."""
+        # Binary search on the length: a common substring of length n implies
+        # one of every shorter length. Each probe hashes the n-length windows
+        # of s2 into a set, so slicing and hashing stay in C.
+        best_start, best_length = 0, 0
+        low, high = 1, min(len(s1), len(s2))
+
+        while low <= high:
+            length = (low + high) // 2
+            windows = {s2[j : j + length] for j in range(len(s2) - length + 1)}
+            start = next(
+                (
+                    i
+                    for i in range(len(s1) - length + 1)
+                    if s1[i : i + length] in windows
+                ),
+                -1,
+            )
+            if start >= 0:
+                best_start, best_length = start, length
+                low = length + 1
+            else:
+                high = length - 1
 
-    def _get_part_number(self, video_file: VideoFile) -> int:
-        """Get part number for sorting, default to 1 if no parts detected."""
-        if video_file.detected_parts:
-            return video_file.detected_parts[0].part_number
-        return 1
+        return s1[best_start : best_start + best_length]
 
     def _extract_video_id(self, filename: str) -> str | None:
         """Extract video ID from filename to prevent grouping different videos."""
         # FC2-PPV patterns
-        fc2_patterns = [
-            r"FC2-PPV-(\d{6,8})",
-            r"fc2-ppv-(\d{6,8})",
-            r"FC2PPV-(\d{6,8})",
-            r"ppv-(\d{6,8})",
-        ]
-
-        for pattern in fc2_patterns:
-            match = re.search(pattern, filename, re.IGNORECASE)
+        for pattern in self._FC2_ID_PATTERNS:
+            match = pattern.search(filename)
             if match:
                 return f"FC2-PPV-{match.group(1)}"
 
         # DMM/JAV patterns
-        dmm_patterns = [
-            r"([A-Z]{2,5}-\d{3,4})",
-            r"([A-Z]{3,5}\d{3,4})",
-            r"(\d{6}_\d{3})",
-        ]
-
-        for pattern in dmm_patterns:
-            match = re.search(pattern, filename)
+        for pattern in self._DMM_ID_PATTERNS:
+            match = pattern.search(filename)
             if match:
                 return match.group(1)
 
@@ -191,7 +289,8 @@ class PartDetector:
 class VideoScanner:
     """Scans directories for video files and creates VideoFile objects."""
 
-    VIDEO_EXTENSIONS = {
+    # Tuple so _is_video_file can test every extension in one str.endswith call
+    VIDEO_EXTENSIONS: tuple[str, ...] = (
         ".mp4",
         ".mkv",
         ".avi",
@@ -202,31 +301,43 @@ class VideoScanner:
         ".m4v",
         ".mpg",
         ".mpeg",
-    }
-
-    def __init__(self, part_detector: PartDetector | None = None):
-        """Initialize scanner with optional custom part detector."""
+    )
+
+    def __init__(
+        self,
+        part_detector: PartDetector | None = None,
+        max_workers: int | None = None,
+    ):
+        """Initialize scanner with optional custom part detector.
+
+        Args:
+            part_detector: Part detector to use (defaults to PartDetector()).
+            max_workers: Thread count for stat/part detection. None uses the
+                ThreadPoolExecutor default; 1 disables threading.
+        """
         self.part_detector = part_detector or PartDetector()
+        self.max_workers = max_workers
 
     def scan_directory(
         self, directory: Path, recursive: bool = True
     ) -> list[VideoFile]:
         """Scan directory for video files."""
-        video_files = []
+        candidates = list(self._iter_video_entries(directory, recursive))
 
-        pattern = "**/*" if recursive else "*"
-        for file_path in directory.glob(pattern):
-            if self._is_video_file(file_path):
-                video_file = self._create_video_file(file_path)
-                video_files.append(video_file)
+        # stat() and part detection run in worker threads so they overlap I/O
+        return self._map(self._create_video_file, candidates)
 
-        return video_files
+    def iter_directory(
+        self, directory: Path, recursive: bool = True
+    ) -> Iterator[VideoFile]:
+        """Lazily yield video files, keeping memory flat on very large trees."""
+        for entry in self._iter_video_entries(directory, recursive):
+            yield self._create_video_file(entry)
 
     def scan_multiple_directories(self, directories: list[Path]) -> list[VideoFile]:
         """Scan multiple directories for video files."""
         all_files = []
-        for directory in directories:
-            files = self.scan_directory(directory)
+        for files in self._map(self.scan_directory, directories):
             all_files.extend(files)
         return all_files
 
@@ -236,27 +347,75 @@ class VideoScanner:
         """Group video files by similarity and part detection."""
         return self.part_detector.group_related_files(video_files, similarity_threshold)
 
-    def _is_video_file(self, file_path: Path) -> bool:
-        """Check if file is a video file based on extension."""
-        return file_path.is_file() and file_path.suffix.lower() in self.VIDEO_EXTENSIONS
-
-    def _create_video_file(self, file_path: Path) -> VideoFile:
-        """Create VideoFile object from file path."""
-        folder_name = file_path.parent.name
-        file_name = file_path.name
+    def _map(self, func: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+        """Apply func to items on a thread pool, preserving input order."""
+        items = list(items)
+        if self.max_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
+
+    def _iter_video_entries(
+        self, directory: Path, recursive: bool
+    ) -> Iterator[os.DirEntry[str]]:
+        """Yield scandir entries for video files below directory."""
+        return filter(self._is_video_file, self._walk(directory, recursive))
+
+    def _walk(self, directory: Path, recursive: bool) -> Iterator[os.DirEntry[str]]:
+        """Yield directory entries below directory using os.scandir.
+
+        Walks with an explicit stack rather than nested generators, so each
+        entry is yielded directly however deep the tree is. Directories are
+        visited in the same order as a recursive depth-first walk. Symlinked
+        directories are not descended into, so link cycles cannot repeat or
+        loop the walk.
+        """
+        stack: list[str | Path] = [directory]
+        while stack:
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        yield entry
+                        if recursive and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+
+    def _is_video_file(self, entry: os.DirEntry[str]) -> bool:
+        """Check if entry is a video file based on extension."""
+        # DirEntry.is_file() uses the d_type cached by readdir, so the
+        # extension check on the raw name avoids a stat for non-videos.
+        return entry.name.lower().endswith(self.VIDEO_EXTENSIONS) and entry.is_file()
+
+    def _create_video_file(self, entry: os.DirEntry[str]) -> VideoFile:
+        """Create VideoFile object from a scandir entry."""
+        # Derive names from the entry's strings; Path is only built once,
+        # for the public file_path, rather than per .parent/.stem access.
+        file_path = Path(entry.path)
+        stem = os.path.splitext(entry.name)[0]
+        folder_name = os.path.basename(os.path.dirname(entry.path))
         detected_parts = self.part_detector.detect_parts(file_path)
 
-        # Get file size
+        # is_file() answered from readdir's d_type, so this is the file's only
+        # stat call; DirEntry caches the result for the size and inode fields.
         try:
-            file_size = file_path.stat().st_size
+            st = entry.stat()
         except OSError:
-            file_size = None
+            file_size = st_dev = st_ino = None
+        else:
+            file_size, st_dev, st_ino = st.st_size, st.st_dev, st.st_ino
 
         return VideoFile(
             file_path=file_path,
             folder_name=folder_name,
-            file_name=file_name,
+            file_name=entry.name,
             detected_parts=detected_parts,
             source_hints=[],  # Will be populated by source detector
             file_size=file_size,
+            clean_stem=self.part_detector._remove_part_indicators(stem),
+            st_dev=st_dev,
+            st_ino=st_ino,
         )
@@ -0,0 +1,55 @@
+"""Test deterministic fault injection transport."""
+
+import httpx
+import pytest
+
+from taggrr.api.chaos import ChaosMiddleware, ChaosRule
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"ok": True})
+
+
+async def _statuses(seed: int, count: int = 20) -> list[int]:
+    chaos = ChaosMiddleware(
+        ChaosRule("500", rate=0.5), seed, transport=httpx.MockTransport(_ok)
+    )
+    async with httpx.AsyncClient(transport=chaos) as client:
+        return [
+            (await client.get("http://api.test/x")).status_code for _ in range(count)
+        ]
+
+
+def test_rule_rejects_unknown_fault():
+    """Test that unsupported faults are rejected up front."""
+    with pytest.raises(ValueError):
+        ChaosRule("teapot")
+
+
+def test_rule_rejects_invalid_rate():
+    """Test that rates outside [0, 1] are rejected."""
+    with pytest.raises(ValueError):
+        ChaosRule("500", rate=1.5)
+
+
+@pytest.mark.asyncio
+async def test_same_seed_injects_same_faults():
+    """Test fault sequence is reproducible for a given seed."""
+    first = await _statuses(seed=42)
+
+    assert first == await _statuses(seed=42)
+    assert set(first) == {200, 500}
+
+
+@pytest.mark.asyncio
+async def test_match_limits_faults_to_matching_urls():
+    """Test that only URLs containing the match string are faulted."""
+    chaos = ChaosMiddleware(
+        ChaosRule("timeout", match="/bad"), transport=httpx.MockTransport(_ok)
+    )
+    async with httpx.AsyncClient(transport=chaos) as client:
+        assert (await client.get("http://api.test/good")).status_code == 200
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get("http://api.test/bad")
+
+    assert chaos.injected == 1
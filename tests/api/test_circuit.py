@@ -0,0 +1,69 @@
+"""Test circuit breaker state transitions."""
+
+from taggrr.api.circuit import CircuitBreaker, CircuitState
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        """Test that a success in between failures keeps the circuit closed."""
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        """Test that after the timeout only one probe is let through."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.allow_request()
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe reopens the circuit for another timeout."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        clock.now = 15
+        assert not breaker.allow_request()
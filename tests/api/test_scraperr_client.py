@@ -1,20 +1,90 @@
 """Test scraperr API client functionality."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock, Mock, patch
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import httpx
 import pytest
 
+from taggrr.api.chaos import ChaosMiddleware, ChaosRule
+from taggrr.api.circuit import CircuitState
 from taggrr.api.scraperr_client import (
     APIResponse,
     MetadataProcessor,
     ScraperAPIClient,
     VideoMatcher,
 )
+from taggrr.config.settings import TaggerrConfig
 from taggrr.core.models import ConfidenceBreakdown, MatchResult, SourceType
 
 
+def _json_body(data) -> bytes:
+    """Encode data as a JSON response body."""
+    return json.dumps(data).encode()
+
+
+def _resp(status_code, payload=None, *, content=None, text="", headers=None):
+    """Build a lightweight response stand-in (far cheaper than ``Mock``)."""
+    if content is None:
+        content = _json_body(payload) if payload is not None else b""
+    return SimpleNamespace(
+        status_code=status_code, content=content, text=text, headers=headers or {}
+    )
+
+
+def _stream_response(chunks=(), error=None, error_after=None):
+    """Build a mock for ``client.stream(...)`` yielding the given chunks."""
+    response = Mock()
+    response.raise_for_status = Mock(side_effect=error)
+
+    async def aiter_bytes(chunk_size=None):
+        for chunk in chunks:
+            yield chunk
+        if error_after is not None:
+            raise error_after
+
+    response.aiter_bytes = aiter_bytes
+
+    stream = MagicMock()
+    stream.__aenter__.return_value = response
+    return stream
+
+
+@pytest.fixture(scope="module")
+async def shared_client():
+    """Create one API client per module; building httpx clients is costly."""
+    client = ScraperAPIClient(TaggerrConfig())
+    http_client = client.client
+    yield client
+    await http_client.aclose()
+
+
+def _echo_video(request: httpx.Request) -> httpx.Response:
+    """Healthy upstream: echo the requested video ID as JSON."""
+    return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+
+@pytest.fixture
+async def chaos_client():
+    """Build API clients whose transport injects faults from a ChaosRule."""
+    clients = []
+
+    def build(rule, seed=0):
+        client = ScraperAPIClient(TaggerrConfig())
+        client.retry_delay = 0  # Retry immediately
+        chaos = ChaosMiddleware(rule, seed, transport=httpx.MockTransport(_echo_video))
+        client.client = httpx.AsyncClient(transport=chaos)
+        clients.append(client)
+        return client, chaos
+
+    yield build
+    for client in clients:
+        await client.close()
+
+
 class TestAPIResponse:
     """Test APIResponse data class."""
 
@@ -48,34 +118,50 @@ class TestScraperAPIClient:
     """Test scraperr API client."""
 
     @pytest.fixture
-    def mock_client(self, test_config):
-        """Create API client with mocked HTTP client."""
-        client = ScraperAPIClient(test_config)
-        client.client = AsyncMock()
-        return client
+    def mock_client(self, shared_client):
+        """Yield the shared client with a fresh mocked HTTP client per test."""
+        state = dict(vars(shared_client))
+        shared_client.client = AsyncMock()
+        yield shared_client
+        # Undo per-test tweaks (thresholds, semaphores, tripped breakers)
+        vars(shared_client).clear()
+        vars(shared_client).update(state)
+        shared_client._breakers.clear()
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self):
+        """Test HTTP/2 opt-in degrades to HTTP/1.1 when h2 is missing."""
+        config = TaggerrConfig()
+        config.api.http2 = True
+
+        with patch("taggrr.api.scraperr_client._HAS_H2", False):
+            client = ScraperAPIClient(config)
+
+        assert client.http2 is False
+        await client.close()
 
     @pytest.mark.asyncio
     async def test_search_video_success(self, mock_client):
         """Test successful video search."""
         # Mock successful response matching expected API structure
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": "FC2-PPV-1234567",
-            "title": "Test Video Title",
-            "year": 2024,
-            "description": "A test video description",
-            "poster_url": "https://example.com/poster.jpg",
-            "fanart_url": "https://example.com/fanart.jpg",
-            "source": "fc2",
-            "confidence": 0.95,
-            "genres": ["Action", "Drama"],
-            "director": "Test Director",
-            "duration": 7200,
-            "rating": 8.5,
-            "studio": "Test Studio",
-        }
-        mock_client.client.request.return_value = mock_response
+        mock_client.client.request.return_value = _resp(
+            200,
+            {
+                "id": "FC2-PPV-1234567",
+                "title": "Test Video Title",
+                "year": 2024,
+                "description": "A test video description",
+                "poster_url": "https://example.com/poster.jpg",
+                "fanart_url": "https://example.com/fanart.jpg",
+                "source": "fc2",
+                "confidence": 0.95,
+                "genres": ["Action", "Drama"],
+                "director": "Test Director",
+                "duration": 7200,
+                "rating": 8.5,
+                "studio": "Test Studio",
+            },
+        )
 
         result = await mock_client.search_video("FC2-PPV-1234567", SourceType.FC2)
 
@@ -96,14 +182,14 @@ class TestScraperAPIClient:
     @pytest.mark.asyncio
     async def test_search_video_without_source_hint(self, mock_client):
         """Test video search without source hint."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": "TEST-123",
-            "title": "Generic Video",
-            "source": "generic",
-        }
-        mock_client.client.request.return_value = mock_response
+        mock_client.client.request.return_value = _resp(
+            200,
+            {
+                "id": "TEST-123",
+                "title": "Generic Video",
+                "source": "generic",
+            },
+        )
 
         result = await mock_client.search_video("TEST-123")
 
@@ -116,9 +202,7 @@ class TestScraperAPIClient:
     @pytest.mark.asyncio
     async def test_search_video_not_found(self, mock_client):
         """Test video not found response."""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_client.client.request.return_value = mock_response
+        mock_client.client.request.return_value = _resp(404)
 
         result = await mock_client.search_video("nonexistent")
 
@@ -127,66 +211,104 @@ class TestScraperAPIClient:
         assert result.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_search_video_invalid_json(self, mock_client):
-        """Test handling of invalid JSON response."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        mock_client.client.request.return_value = mock_response
+    async def test_search_video_non_json_content_type(self, mock_client):
+        """Test that non-JSON content types are rejected without parsing."""
+        mock_client.client.request.return_value = _resp(
+            200,
+            content=b"<html>Bad Gateway</html>",
+            headers={"content-type": "text/html"},
+        )
 
-        result = await mock_client.search_video("test")
+        with patch("taggrr.api.scraperr_client._json_loads") as mock_loads:
+            result = await mock_client.search_video("test")
 
         assert result.success is False
-        assert "Invalid JSON response" in result.error
+        assert result.error == "Invalid JSON response (content-type=text/html)"
         assert result.status_code == 200
+        mock_loads.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_search_video_rate_limited_with_retry(self, mock_client):
         """Test rate limiting with successful retry."""
         # First call is rate limited, second succeeds
         responses = [
-            Mock(status_code=429),
-            Mock(status_code=200, json=lambda: {"id": "test", "title": "Test"}),
+            _resp(429),
+            _resp(200, {"id": "test", "title": "Test"}),
         ]
         mock_client.client.request.side_effect = responses
 
-        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        with (
+            patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+            patch("random.uniform", return_value=0.25) as mock_uniform,
+        ):
             result = await mock_client.search_video("test")
 
         assert result.success is True
         assert result.data["id"] == "test"
         assert mock_client.client.request.call_count == 2
-        mock_sleep.assert_called_once()  # Should wait before retry
+        # Full jitter over [0, retry_delay * 2**attempt] before the retry
+        mock_uniform.assert_called_once_with(0, mock_client.retry_delay)
+        mock_sleep.assert_called_once_with(0.25)
 
     @pytest.mark.asyncio
-    async def test_search_video_rate_limited_max_retries(self, mock_client):
-        """Test rate limiting exceeding max retries."""
-        mock_response = Mock()
-        mock_response.status_code = 429
-        mock_client.client.request.return_value = mock_response
+    async def test_search_video_rate_limited_honors_retry_after(self, mock_client):
+        """Test that Retry-After sets the minimum wait before retrying."""
+        responses = [
+            _resp(429, headers={"Retry-After": "5"}),
+            _resp(200, {"id": "test", "title": "Test"}),
+        ]
+        mock_client.client.request.side_effect = responses
 
-        with patch("asyncio.sleep", new_callable=AsyncMock):
+        with (
+            patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+            patch("random.uniform", return_value=0.25),
+        ):
             result = await mock_client.search_video("test")
 
-        assert result.success is False
-        assert result.error == "Rate limited"
-        assert result.status_code == 429
-        assert mock_client.client.request.call_count == mock_client.max_retries + 1
+        assert result.success is True
+        mock_sleep.assert_called_once_with(5.0)
 
     @pytest.mark.asyncio
-    async def test_search_video_server_error(self, mock_client):
-        """Test server error handling."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-        mock_client.client.request.return_value = mock_response
+    async def test_search_video_circuit_opens_after_server_errors(self, mock_client):
+        """Test that repeated 5xx responses open the circuit and fail fast."""
+        mock_client.client.request.return_value = _resp(
+            500, text="Internal Server Error"
+        )
 
-        result = await mock_client.search_video("test")
+        results = [await mock_client.search_video("test") for _ in range(6)]
 
-        assert result.success is False
-        assert "HTTP 500" in result.error
-        assert "Internal Server Error" in result.error
-        assert result.status_code == 500
+        assert all("HTTP 500" in r.error for r in results[:5])
+        assert results[5].success is False
+        assert results[5].error == "Circuit open"
+        assert results[5].status_code == 503
+        assert mock_client.client.request.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_cancelled_half_open_probe_releases_circuit(self, mock_client):
+        """Test cancelling the half-open probe lets a later probe through."""
+        breaker = mock_client._breaker_for(mock_client.base_url)
+        breaker.reset_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        started = asyncio.Event()
+
+        async def hang(method, url, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        mock_client.client.request.side_effect = hang
+        probe = asyncio.create_task(mock_client.search_video("A"))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        mock_client.client.request.side_effect = None
+        mock_client.client.request.return_value = _resp(200, {"id": "B"})
+        result = await mock_client.search_video("B")
+
+        assert result.success is True
+        assert breaker.state is CircuitState.CLOSED
 
     @pytest.mark.asyncio
     async def test_search_multiple_ids(self, mock_client):
@@ -195,20 +317,20 @@ class TestScraperAPIClient:
         def mock_request(method, url, **kwargs):
             """Mock request that returns different responses based on URL."""
             if "FC2-PPV-1111111" in url:
-                return Mock(
-                    status_code=200,
-                    json=lambda: {
+                return _resp(
+                    200,
+                    {
                         "id": "FC2-PPV-1111111",
                         "title": "Video 1",
                         "source": "fc2",
                     },
                 )
             elif "FC2-PPV-2222222" in url:
-                return Mock(status_code=404)
+                return _resp(404)
             else:
-                return Mock(
-                    status_code=200,
-                    json=lambda: {
+                return _resp(
+                    200,
+                    {
                         "id": "FC2-PPV-3333333",
                         "title": "Video 3",
                         "source": "fc2",
@@ -226,44 +348,182 @@ class TestScraperAPIClient:
         assert results["FC2-PPV-1111111"].data["title"] == "Video 1"
         assert results["FC2-PPV-2222222"].success is False
         assert results["FC2-PPV-3333333"].success is True
+        assert mock_client.client.request.call_count == 3
 
     @pytest.mark.asyncio
-    async def test_search_multiple_ids_with_exception(self, mock_client):
-        """Test multiple ID search with exception handling."""
+    async def test_search_multiple_ids_batched(self, mock_client):
+        """Test that large batches are fetched with a single POST."""
+        mock_client.batch_threshold = 3
+        mock_client.client.request.return_value = _resp(
+            200,
+            {
+                "FC2-PPV-1111111": {"id": "FC2-PPV-1111111", "title": "Video 1"},
+                "FC2-PPV-2222222": None,
+                "FC2-PPV-3333333": {"id": "FC2-PPV-3333333", "title": "Video 3"},
+            },
+        )
+
+        video_ids = ["FC2-PPV-1111111", "FC2-PPV-2222222", "FC2-PPV-3333333"]
+        results = await mock_client.search_multiple_ids(video_ids, SourceType.FC2)
+
+        assert list(results) == video_ids
+        assert results["FC2-PPV-1111111"].data["title"] == "Video 1"
+        assert results["FC2-PPV-2222222"].success is False
+        assert results["FC2-PPV-2222222"].status_code == 404
+        assert results["FC2-PPV-3333333"].success is True
+
+        mock_client.client.request.assert_called_once()
+        args, kwargs = mock_client.client.request.call_args
+        assert kwargs["method"] == "POST"
+        assert kwargs["url"].endswith("/batch")
+        assert kwargs["json"] == {"ids": video_ids, "source": "fc2"}
+
+    @pytest.mark.asyncio
+    async def test_search_multiple_ids_batch_fallback(self, mock_client):
+        """Test per-ID fallback when the server lacks the batch endpoint."""
+        mock_client.batch_threshold = 2
 
         def mock_request(method, url, **kwargs):
-            if "good_id" in url:
-                return Mock(
-                    status_code=200, json=lambda: {"id": "good_id", "title": "Good"}
-                )
-            else:
-                raise httpx.TimeoutException("Timeout")
+            if method == "POST":
+                return _resp(404)
+            return _resp(200, {"id": url[-1]})
+
+        mock_client.client.request.side_effect = mock_request
+
+        results = await mock_client.search_multiple_ids(["A", "B"])
+
+        assert results["A"].data == {"id": "A"}
+        assert results["B"].data == {"id": "B"}
+        assert mock_client.client.request.call_count == 3
+
+        # The missing endpoint is remembered, so later batches skip the probe
+        await mock_client.search_multiple_ids(["C", "D"])
+        assert mock_client.client.request.call_count == 5
+        assert all(
+            c.kwargs["method"] == "GET"
+            for c in mock_client.client.request.call_args_list[3:]
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_failures_skip_circuit_breaker(self, mock_client):
+        """Test a failing batch probe never opens the host's circuit."""
+        mock_client.max_retries = 0
+        mock_client.client.request.return_value = _resp(503)
+
+        for _ in range(mock_client.config.api.circuit_failure_threshold + 1):
+            assert await mock_client.search_batch(["A", "B"]) is None
+
+        breaker = mock_client._breaker_for(mock_client.base_url)
+        assert breaker.allow_request()
+        assert mock_client._batch_supported is True
+
+    @pytest.mark.asyncio
+    async def test_batch_leaves_half_open_probe_to_per_id_search(self, mock_client):
+        """Test a batch call on a recovering host never takes the probe slot."""
+        mock_client.batch_threshold = 2
+        breaker = mock_client._breaker_for(mock_client.base_url)
+        breaker.reset_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        mock_client.client.request.side_effect = lambda method, url, **kw: _resp(
+            200, {"id": url.rsplit("/", 1)[-1]}
+        )
+
+        await mock_client.search_multiple_ids(["A", "B"])
+        result = await mock_client.search_video("C")
+
+        assert result.success is True
+        assert breaker.state is CircuitState.CLOSED
+        assert all(
+            c.kwargs["method"] == "GET"
+            for c in mock_client.client.request.call_args_list
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch_size", [3, 25])
+    async def test_search_multiple_ids_bounded_concurrency(
+        self, mock_client, batch_size
+    ):
+        """Test that in-flight searches never exceed max_concurrency."""
+        mock_client.batch_threshold = 0  # Exercise the per-ID path
+        mock_client.max_concurrency = 4
+        mock_client._sem = asyncio.Semaphore(4)
+        in_flight = 0
+        peak = 0
+
+        async def mock_request(method, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            assert mock_client._sem._value >= 0
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return _resp(200, {"id": url.rsplit("/", 1)[-1]})
 
         mock_client.client.request.side_effect = mock_request
 
-        results = await mock_client.search_multiple_ids(["good_id", "bad_id"])
+        video_ids = [f"ID-{i}" for i in range(batch_size)]
+        results = await mock_client.search_multiple_ids(video_ids)
+
+        assert list(results) == video_ids
+        assert all(r.success for r in results.values())
+        # Work overlaps up to the limit rather than running one at a time
+        assert peak == min(batch_size, 4)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("fault", "status_code", "error"),
+        [
+            ("429", 429, "Rate limited"),
+            ("500", 500, "HTTP 500: Internal Server Error"),
+            ("timeout", None, "Injected read timeout"),
+            ("badjson", 200, "Invalid JSON response"),
+        ],
+    )
+    async def test_search_video_injected_faults(
+        self, chaos_client, fault, status_code, error
+    ):
+        """Test each injected fault surfaces as a failed response."""
+        client, chaos = chaos_client(ChaosRule(fault))
+
+        result = await client.search_video("test")
+
+        assert result.success is False
+        assert error in result.error
+        assert result.status_code == status_code
+        # Rate limits and timeouts are retried; other faults are final
+        retried = fault in ("429", "timeout")
+        assert chaos.injected == (client.max_retries + 1 if retried else 1)
+
+    @pytest.mark.asyncio
+    async def test_search_multiple_ids_with_exception(self, chaos_client):
+        """Test multiple ID search with exception handling."""
+        client, _ = chaos_client(ChaosRule("timeout", match="bad_id"))
+
+        results = await client.search_multiple_ids(["good_id", "bad_id"])
 
         assert len(results) == 2
         assert results["good_id"].success is True
+        assert results["good_id"].data == {"id": "good_id"}
         assert results["bad_id"].success is False
-        assert "Timeout" in results["bad_id"].error
+        assert "timeout" in results["bad_id"].error
 
     @pytest.mark.asyncio
     async def test_get_video_metadata(self, mock_client):
         """Test getting detailed video metadata."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": "FC2-PPV-1234567",
-            "title": "Detailed Video",
-            "description": "Detailed description with more information",
-            "duration": 7200,
-            "genres": ["Action", "Adventure"],
-            "director": "Famous Director",
-            "rating": 9.2,
-            "studio": "Premium Studio",
-        }
-        mock_client.client.request.return_value = mock_response
+        mock_client.client.request.return_value = _resp(
+            200,
+            {
+                "id": "FC2-PPV-1234567",
+                "title": "Detailed Video",
+                "description": "Detailed description with more information",
+                "duration": 7200,
+                "genres": ["Action", "Adventure"],
+                "director": "Famous Director",
+                "rating": 9.2,
+                "studio": "Premium Studio",
+            },
+        )
 
         result = await mock_client.get_video_metadata("FC2-PPV-1234567")
 
@@ -280,11 +540,8 @@ class TestScraperAPIClient:
     @pytest.mark.asyncio
     async def test_download_asset_success(self, mock_client, temp_dir):
         """Test successful asset download."""
-        asset_content = b"fake image data"
-        mock_response = Mock()
-        mock_response.content = asset_content
-        mock_response.raise_for_status = Mock()
-        mock_client.client.get.return_value = mock_response
+        asset_chunks = [b"fake ", b"image ", b"data"]
+        mock_client.client.stream = Mock(return_value=_stream_response(asset_chunks))
 
         output_path = temp_dir / "assets" / "poster.jpg"
         result = await mock_client.download_asset(
@@ -293,23 +550,20 @@ class TestScraperAPIClient:
 
         assert result is True
         assert output_path.exists()
-        assert output_path.read_bytes() == asset_content
+        assert output_path.read_bytes() == b"".join(asset_chunks)
 
         # Verify directory was created
         assert output_path.parent.exists()
 
-        mock_client.client.get.assert_called_once_with(
-            "https://example.com/poster.jpg", follow_redirects=True
+        mock_client.client.stream.assert_called_once_with(
+            "GET", "https://example.com/poster.jpg", follow_redirects=True
         )
 
     @pytest.mark.asyncio
     async def test_download_asset_http_error(self, mock_client, temp_dir):
         """Test asset download with HTTP error."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "404 Not Found", request=Mock(), response=Mock()
-        )
-        mock_client.client.get.return_value = mock_response
+        error = httpx.HTTPStatusError("404 Not Found", request=Mock(), response=Mock())
+        mock_client.client.stream = Mock(return_value=_stream_response(error=error))
 
         output_path = temp_dir / "poster.jpg"
         result = await mock_client.download_asset(
@@ -319,6 +573,25 @@ class TestScraperAPIClient:
         assert result is False
         assert not output_path.exists()
 
+    @pytest.mark.asyncio
+    async def test_download_asset_interrupted_removes_partial_file(
+        self, mock_client, temp_dir
+    ):
+        """Test that a stream failing mid-download leaves no partial file."""
+        mock_client.client.stream = Mock(
+            return_value=_stream_response(
+                [b"partial"], error_after=httpx.ReadError("connection reset")
+            )
+        )
+
+        output_path = temp_dir / "poster.jpg"
+        result = await mock_client.download_asset(
+            "https://example.com/poster.jpg", output_path
+        )
+
+        assert result is False
+        assert not output_path.exists()
+
     @pytest.mark.asyncio
     async def test_context_manager(self, test_config):
         """Test async context manager functionality."""
@@ -453,6 +726,19 @@ class TestMetadataProcessor:
         # Should use default confidence
         assert confidence.overall_confidence > 0.7
 
+    def test_calculate_confidence_is_memoized(self, processor):
+        """Test that identical inputs share one immutable breakdown."""
+        data = {"id": "TEST-123", "confidence": 0.9, "source": "fc2"}
+
+        first = processor._calculate_match_confidence(data, "TEST-123", SourceType.FC2)
+        second = processor._calculate_match_confidence(
+            dict(data), "TEST-123", SourceType.FC2
+        )
+
+        assert first is second
+        with pytest.raises(AttributeError):
+            first.overall_confidence = 0.0
+
     def test_determine_source_from_api(self, processor):
         """Test source determination from API response."""
         test_cases = [
@@ -463,6 +749,8 @@ class TestMetadataProcessor:
             ({"source": "unknown"}, SourceType.FC2, SourceType.FC2),  # Fallback to hint
             ({}, SourceType.DMM, SourceType.DMM),  # Use hint when no API source
             ({"source": ""}, None, SourceType.GENERIC),  # Empty source
+            ({"source": None}, SourceType.FC2, SourceType.FC2),  # Null source
+            ({"source": " FC2 "}, None, SourceType.FC2),  # Padded source
         ]
 
         for data, hint, expected in test_cases:
@@ -538,14 +826,10 @@ class TestVideoMatcher:
         with patch.object(matcher.processor, "process_search_response") as mock_process:
             mock_process.return_value = mock_match_result
 
-            with patch(
-                "taggrr.api.scraperr_client.ScraperAPIClient"
-            ) as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-                mock_client.search_video.return_value = APIResponse(
-                    success=True, data={}
-                )
+            with patch.object(
+                matcher._client, "search_video", new_callable=AsyncMock
+            ) as mock_search:
+                mock_search.return_value = APIResponse(success=True, data={})
 
                 result = await matcher.match_video(
                     "FC2-PPV-1234567", [], SourceType.FC2
@@ -556,9 +840,7 @@ class TestVideoMatcher:
         assert result.confidence_breakdown.overall_confidence == 0.85
 
         # Should only try primary ID
-        mock_client.search_video.assert_called_once_with(
-            "FC2-PPV-1234567", SourceType.FC2
-        )
+        mock_search.assert_called_once_with("FC2-PPV-1234567", SourceType.FC2)
 
     @pytest.mark.asyncio
     async def test_match_video_primary_low_confidence(self, matcher):
@@ -582,14 +864,10 @@ class TestVideoMatcher:
         with patch.object(matcher.processor, "process_search_response") as mock_process:
             mock_process.side_effect = [low_confidence_result, high_confidence_result]
 
-            with patch(
-                "taggrr.api.scraperr_client.ScraperAPIClient"
-            ) as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-                mock_client.search_video.return_value = APIResponse(
-                    success=True, data={}
-                )
+            with patch.object(
+                matcher._client, "search_video", new_callable=AsyncMock
+            ) as mock_search:
+                mock_search.return_value = APIResponse(success=True, data={})
 
                 result = await matcher.match_video(
                     "FC2-PPV-1234567", ["ALT-456"], SourceType.FC2
@@ -600,7 +878,7 @@ class TestVideoMatcher:
         assert result.confidence_breakdown.overall_confidence == 0.8
 
         # Should try both primary and alternative
-        assert mock_client.search_video.call_count == 2
+        assert mock_search.call_count == 2
 
     @pytest.mark.asyncio
     async def test_match_video_no_alternatives(self, matcher):
@@ -616,21 +894,17 @@ class TestVideoMatcher:
         with patch.object(matcher.processor, "process_search_response") as mock_process:
             mock_process.return_value = low_confidence_result
 
-            with patch(
-                "taggrr.api.scraperr_client.ScraperAPIClient"
-            ) as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-                mock_client.search_video.return_value = APIResponse(
-                    success=True, data={}
-                )
+            with patch.object(
+                matcher._client, "search_video", new_callable=AsyncMock
+            ) as mock_search:
+                mock_search.return_value = APIResponse(success=True, data={})
 
                 result = await matcher.match_video("TEST-123", [])
 
         assert result is None  # Low confidence and no alternatives
 
         # Should only try primary
-        mock_client.search_video.assert_called_once_with("TEST-123", None)
+        mock_search.assert_called_once_with("TEST-123", None)
 
     @pytest.mark.asyncio
     async def test_match_video_all_alternatives_fail(self, matcher):
@@ -638,19 +912,17 @@ class TestVideoMatcher:
         with patch.object(matcher.processor, "process_search_response") as mock_process:
             mock_process.return_value = None  # All searches fail
 
-            with patch(
-                "taggrr.api.scraperr_client.ScraperAPIClient"
-            ) as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-                mock_client.search_video.return_value = APIResponse(success=False)
+            with patch.object(
+                matcher._client, "search_video", new_callable=AsyncMock
+            ) as mock_search:
+                mock_search.return_value = APIResponse(success=False)
 
                 result = await matcher.match_video("nonexistent", ["alt1", "alt2"])
 
         assert result is None
 
         # Should try primary + 2 alternatives
-        assert mock_client.search_video.call_count == 3
+        assert mock_search.call_count == 3
 
     @pytest.mark.asyncio
     async def test_download_assets_success(self, matcher, temp_dir):
@@ -666,35 +938,45 @@ class TestVideoMatcher:
             },
         )
 
-        with patch("taggrr.api.scraperr_client.ScraperAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client.download_asset.return_value = True
+        with patch.object(
+            matcher._client, "download_asset", new_callable=AsyncMock
+        ) as mock_download:
+            mock_download.return_value = True
 
             downloaded = await matcher.download_assets(match_result, temp_dir)
 
-        assert "poster.jpg" in downloaded
+        assert "folder.jpg" in downloaded
         assert "fanart.jpg" in downloaded
         assert len(downloaded) == 2
 
-        # Verify download calls with correct paths
+        # Verify download calls with correct paths (poster is saved as folder.jpg)
         expected_calls = [
-            (match_result.api_response["poster_url"], temp_dir / "poster.jpg"),
+            (match_result.api_response["poster_url"], temp_dir / "folder.jpg"),
             (match_result.api_response["fanart_url"], temp_dir / "fanart.jpg"),
         ]
 
-        actual_calls = mock_client.download_asset.call_args_list
+        actual_calls = mock_download.call_args_list
         assert len(actual_calls) == 2
 
         for call, (expected_url, expected_path) in zip(actual_calls, expected_calls):
             args, kwargs = call
             assert args[0] == expected_url
-            assert args[1] == expected_path
+            assert args[1] == os.fspath(expected_path)
+
+    @pytest.mark.asyncio
+    async def test_matcher_reuses_and_closes_client(self, test_config):
+        """Test that the matcher shares one client and closes it on exit."""
+        async with VideoMatcher(test_config) as matcher:
+            client = matcher._client
+            assert not client.client.is_closed
+
+        assert matcher._client is client
+        assert client.client.is_closed
 
     @pytest.mark.asyncio
-    async def test_download_assets_disabled(self, matcher, temp_dir):
+    async def test_download_assets_disabled(self, matcher, temp_dir, monkeypatch):
         """Test when asset downloading is disabled."""
-        matcher.config.plex_output.download_assets = False
+        monkeypatch.setattr(matcher.config.plex_output, "download_assets", False)
 
         match_result = MatchResult(
             video_metadata={},
@@ -722,15 +1004,15 @@ class TestVideoMatcher:
             },
         )
 
-        with patch("taggrr.api.scraperr_client.ScraperAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            # Poster succeeds, fanart fails
-            mock_client.download_asset.side_effect = [True, False]
+        with patch.object(
+            matcher._client, "download_asset", new_callable=AsyncMock
+        ) as mock_download:
+            # Poster succeeds, fanart fails (keyed by URL: order-independent)
+            mock_download.side_effect = lambda url, path: url.endswith("poster.jpg")
 
             downloaded = await matcher.download_assets(match_result, temp_dir)
 
-        assert "poster.jpg" in downloaded
+        assert "folder.jpg" in downloaded
         assert "fanart.jpg" not in downloaded
         assert len(downloaded) == 1
 
@@ -1,10 +1,30 @@
 """Test configuration management functionality."""
 
+import re
+from unittest.mock import patch
+
 import pytest
 import yaml
 
 from taggrr.config.settings import ConfigManager, PatternConfig, TaggerrConfig
 
+EXISTING_CONFIG_YAML = """\
+api:
+  base_url: http://existing:8080
+  timeout: 60
+plex_output:
+  folder_format: "{title} [{year}]"
+  create_nfo: false
+"""
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(temp_dir, monkeypatch):
+    """Keep config snapshots out of the real user cache directory."""
+    path = temp_dir / "snapshots"
+    monkeypatch.setattr(ConfigManager, "SNAPSHOT_DIR", path)
+    return path
+
 
 class TestConfigManager:
     """Test configuration manager functionality."""
@@ -44,13 +64,7 @@ class TestConfigManager:
         config_path = temp_dir / "existing_config.yaml"
 
         # Create config file manually
-        config_data = {
-            "api": {"base_url": "http://existing:8080", "timeout": 60},
-            "plex_output": {"folder_format": "{title} [{year}]", "create_nfo": False},
-        }
-
-        with open(config_path, "w") as f:
-            yaml.dump(config_data, f)
+        config_path.write_text(EXISTING_CONFIG_YAML)
 
         # Load with manager
         manager = ConfigManager(config_path)
@@ -61,13 +75,90 @@ class TestConfigManager:
         assert config.plex_output.folder_format == "{title} [{year}]"
         assert config.plex_output.create_nfo == False
 
+    def test_load_reuses_parsed_config_until_file_changes(self, temp_dir):
+        """Test repeated loads skip parsing unless the file changes."""
+        config_path = temp_dir / "cached_config.yaml"
+        config_path.write_text("api:\n  base_url: http://first:8000\n")
+        manager = ConfigManager(config_path)
+
+        with patch("taggrr.config.settings.yaml.load", wraps=yaml.load) as mock_load:
+            first = manager.load()
+            second = ConfigManager(config_path).load()
+
+        assert mock_load.call_count == 1
+        assert second.api.base_url == "http://first:8000"
+
+        # Cached copies are independent of each other
+        first.api.base_url = "http://mutated:8000"
+        assert manager.load().api.base_url == "http://first:8000"
+
+        config_path.write_text("api:\n  base_url: http://second:8000\n")
+        assert manager.load().api.base_url == "http://second:8000"
+
+    def test_load_uses_snapshot_written_by_save(
+        self, temp_dir, snapshot_dir, monkeypatch
+    ):
+        """Test a fresh process reloads a saved config without parsing YAML."""
+        config_path = temp_dir / "snapshot_config.yaml"
+        config = TaggerrConfig()
+        config.api.base_url = "http://snapshot:8000"
+        manager = ConfigManager(config_path)
+        manager.save(config)
+        assert manager._snapshot_path.parent == snapshot_dir
+        assert manager._snapshot_path.exists()
+        assert sorted(p.name for p in temp_dir.iterdir()) == [
+            "snapshot_config.yaml",
+            "snapshots",
+        ]
+
+        # Simulate a new process: nothing cached in memory
+        monkeypatch.setattr(ConfigManager, "_parse_cache", {})
+        with patch("taggrr.config.settings.yaml.load") as mock_load:
+            loaded = ConfigManager(config_path).load()
+
+        mock_load.assert_not_called()
+        assert loaded.api.base_url == "http://snapshot:8000"
+        assert loaded.id_extraction.strong_patterns[0].compiled.search(
+            "FC2-PPV-1234567"
+        )
+
+        # A hand-edited YAML file no longer matches the snapshot
+        monkeypatch.setattr(ConfigManager, "_parse_cache", {})
+        config_path.write_text("api:\n  base_url: http://edited:8000\n")
+        assert ConfigManager(config_path).load().api.base_url == "http://edited:8000"
+
+    def test_corrupt_snapshot_falls_back_to_yaml(self, temp_dir, monkeypatch):
+        """Test an unreadable snapshot is ignored in favour of the YAML file."""
+        config_path = temp_dir / "corrupt_snapshot.yaml"
+        config = TaggerrConfig()
+        config.api.base_url = "http://yaml:8000"
+        manager = ConfigManager(config_path)
+        manager.save(config)
+        manager._snapshot_path.write_bytes(b"\x00garbage")
+
+        monkeypatch.setattr(ConfigManager, "_parse_cache", {})
+        assert ConfigManager(config_path).load().api.base_url == "http://yaml:8000"
+
+    def test_unwritable_snapshot_dir_still_saves(self, temp_dir, monkeypatch):
+        """Test a snapshot that cannot be written does not fail save()."""
+        blocker = temp_dir / "not_a_dir"
+        blocker.write_text("")
+        monkeypatch.setattr(ConfigManager, "SNAPSHOT_DIR", blocker / "snapshots")
+        config_path = temp_dir / "unsnapshotted.yaml"
+        config = TaggerrConfig()
+        config.api.base_url = "http://saved:8000"
+
+        ConfigManager(config_path).save(config)
+
+        monkeypatch.setattr(ConfigManager, "_parse_cache", {})
+        assert ConfigManager(config_path).load().api.base_url == "http://saved:8000"
+
     def test_invalid_config_fallback(self, temp_dir):
         """Test fallback to default when config is invalid."""
         config_path = temp_dir / "invalid_config.yaml"
 
         # Create invalid YAML
-        with open(config_path, "w") as f:
-            f.write("invalid: yaml: content: [")
+        config_path.write_text("invalid: yaml: content: [")
 
         manager = ConfigManager(config_path)
         config = manager.load()
@@ -76,23 +167,37 @@ class TestConfigManager:
         assert isinstance(config, TaggerrConfig)
         assert config.api.base_url == "http://localhost:8000"
 
-    def test_update_config(self, temp_dir):
+    def test_update_config(self, temp_dir, monkeypatch):
         """Test updating configuration values."""
         config_path = temp_dir / "update_config.yaml"
         manager = ConfigManager(config_path)
 
         # Load initial config
         config = manager.load()
-        original_url = config.api.base_url
+        original_timeout = config.api.timeout
 
-        # Update config manually (update_config method needs to be fixed to handle nested updates)
-        config.api.base_url = "http://updated:7000"
-        manager.save(config)
+        manager.update_field("api.base_url", "http://updated:7000")
 
-        # Verify update
+        # Verify update in memory and on disk
         updated_config = manager.get_config()
         assert updated_config.api.base_url == "http://updated:7000"
 
+        monkeypatch.setattr(ConfigManager, "_parse_cache", {})
+        manager._snapshot_path.unlink()
+        reloaded = ConfigManager(config_path).load()
+        assert reloaded.api.base_url == "http://updated:7000"
+        assert reloaded.api.timeout == original_timeout
+
+    def test_update_field_validates_value(self, temp_dir):
+        """Test update_field rejects values that fail field validation."""
+        manager = ConfigManager(temp_dir / "validated_config.yaml")
+        manager.load()
+
+        with pytest.raises(ValueError):
+            manager.update_field("api.max_concurrency", 0)
+
+        assert manager.get_config().api.max_concurrency >= 1
+
     def test_create_sample_config(self, temp_dir):
         """Test sample configuration creation."""
         output_path = temp_dir / "sample_config.yaml"
@@ -103,10 +208,10 @@ class TestConfigManager:
         assert output_path.exists()
 
         # Should be valid YAML with comments
-        content = output_path.read_text()
-        assert "# Taggerr Configuration File" in content
-        assert "matching:" in content
-        assert "source_detection:" in content
+        content = output_path.read_bytes()
+        assert b"# Taggerr Configuration File" in content
+        assert b"matching:" in content
+        assert b"source_detection:" in content
 
 
 class TestTaggerrConfig:
@@ -145,6 +250,40 @@ class TestTaggerrConfig:
                 confidence=-0.1,  # < 0.0
             )
 
+    @pytest.mark.parametrize(
+        "overrides", [{"timeout": 0}, {"retries": -1}, {"retry_delay": -0.5}]
+    )
+    def test_api_config_bounds(self, overrides):
+        """Test API numeric settings are range-checked on validation."""
+        with pytest.raises(ValueError):
+            TaggerrConfig(api=overrides)
+
+    def test_pattern_config_compiles_regex(self):
+        """Test patterns are compiled once, case-insensitively."""
+        pattern = PatternConfig(
+            regex=r"FC2-PPV-(\d+)", format="FC2-PPV-{}", confidence=0.95
+        )
+
+        assert pattern.compiled is pattern.compiled
+        assert pattern.compiled.search("fc2-ppv-123").group(1) == "123"
+
+        # Invalid regexes still validate; the error surfaces on use
+        broken = PatternConfig(regex=r"([unclosed", format="{}", confidence=0.5)
+        with pytest.raises(re.error):
+            broken.compiled
+
+    def test_default_patterns_are_distinct(self):
+        """Test no default pattern differs from another only by case."""
+        config = TaggerrConfig()
+        id_config = config.id_extraction
+        for patterns in (
+            id_config.strong_patterns,
+            id_config.medium_patterns,
+            id_config.weak_patterns,
+        ):
+            lowered = [p.regex.lower() for p in patterns]
+            assert len(lowered) == len(set(lowered))
+
     def test_config_with_custom_patterns(self):
         """Test configuration with custom ID patterns."""
         custom_patterns = [
@@ -3,10 +3,17 @@
 import os
 import shutil
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from uuid import uuid4
 
 import pytest
 
+try:  # Optional in-memory filesystem for tests marked fake_fs
+    import pyfakefs
+except ImportError:
+    pyfakefs = None
+
 from taggrr.config.settings import TaggerrConfig
 from taggrr.core.models import (
     ConfidenceBreakdown,
@@ -16,60 +23,120 @@ from taggrr.core.models import (
 )
 
 
+def _fast_rmtree(path: Path) -> None:
+    """Remove a small directory tree with one scandir pass per directory."""
+    try:
+        _remove_tree(os.fspath(path))
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _remove_tree(path: str) -> None:
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _remove_tree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+
+@pytest.fixture(scope="session")
+def temp_root():
+    """Create one temporary root directory for the whole test session."""
+    root = Path(tempfile.mkdtemp())
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
+
+
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    temp_path = Path(tempfile.mkdtemp())
+def temp_dir(request, temp_root):
+    """Create a fresh temporary directory for a test under the session root.
+
+    Tests marked fake_fs only need names, sizes and inodes; when pyfakefs is
+    installed their directory lives in its in-memory filesystem instead.
+    """
+    temp_path = temp_root / uuid4().hex
+    if pyfakefs is not None and request.node.get_closest_marker("fake_fs"):
+        request.getfixturevalue("fs").create_dir(temp_path)
+        yield temp_path
+        return
+    temp_path.mkdir()
     yield temp_path
-    shutil.rmtree(temp_path, ignore_errors=True)
+    _fast_rmtree(temp_path)
+
+
+@dataclass(frozen=True)
+class FixtureTree:
+    """Canonical folder/file layouts used by name-analysis tests."""
+
+    fc2_file: Path
+    dmm_file: Path
+    conflict_file: Path
+    weighted_file: Path
+    year_file: Path
+
+
+@pytest.fixture(scope="session")
+def fixture_tree():
+    """Provide the canonical layouts as virtual paths (never created on disk)."""
+    root = Path("/virtual")
+    return FixtureTree(
+        fc2_file=root / "FC2-PPV-1234567 Premium" / "FC2-PPV-1234567.mp4",
+        dmm_file=root / "[DMM] Random Folder" / "MIDE-123.mp4",
+        conflict_file=root / "[DMM] Folder" / "FC2-PPV-1234567.mp4",
+        weighted_file=root / "CLEAR-ID-123 Folder" / "cryptic_filename.mp4",
+        year_file=root / "Movie Title (2024)" / "movie.mp4",
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config():
-    """Create a test configuration."""
+    """Create a test configuration shared by the session; treat as read-only."""
     return TaggerrConfig()
 
 
 @pytest.fixture
-def sample_video_files(temp_dir):
-    """Create sample video files for testing."""
-    files = []
+def test_config_mut(test_config):
+    """Create a private copy of the test configuration for tests that mutate it."""
+    return test_config.model_copy(deep=True)
 
-    # Single file
-    single_file = temp_dir / "single_movie.mp4"
-    single_file.touch()
-    files.append(single_file)
 
-    # Multi-part files
-    part1 = temp_dir / "multi_part_1.mkv"
-    part2 = temp_dir / "multi_part_2.mkv"
-    part1.touch()
-    part2.touch()
-    files.extend([part1, part2])
+def _touch(*paths: Path) -> None:
+    """Create empty files with bare open/close calls (cheaper than touch)."""
+    for path in paths:
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
 
-    # FC2 files
-    fc2_dir = temp_dir / "FC2-PPV-1234567"
-    fc2_dir.mkdir()
-    fc2_file = fc2_dir / "FC2-PPV-1234567.mp4"
-    fc2_file.touch()
-    files.append(fc2_file)
 
-    # DMM files
+@pytest.fixture
+def sample_video_files(temp_dir):
+    """Create sample video files for testing."""
+    fc2_dir = temp_dir / "FC2-PPV-1234567"
     dmm_dir = temp_dir / "[DMM] MIDE-123"
+    fc2_dir.mkdir()
     dmm_dir.mkdir()
-    dmm_file = dmm_dir / "MIDE-123_high.mp4"
-    dmm_file.touch()
-    files.append(dmm_file)
+
+    files = [
+        # Single file
+        temp_dir / "single_movie.mp4",
+        # Multi-part files
+        temp_dir / "multi_part_1.mkv",
+        temp_dir / "multi_part_2.mkv",
+        # FC2 files
+        fc2_dir / "FC2-PPV-1234567.mp4",
+        # DMM files
+        dmm_dir / "MIDE-123_high.mp4",
+    ]
+    _touch(*files)
 
     return files
 
 
 @pytest.fixture
-def sample_video_file(temp_dir):
+def sample_video_file():
     """Create a single VideoFile object for testing."""
-    file_path = temp_dir / "test_folder" / "FC2-PPV-1234567.mp4"
-    file_path.parent.mkdir(parents=True)
-    file_path.touch()
+    # Nothing reads the file, so the path never needs to exist on disk
+    file_path = Path("/virtual/test_folder/FC2-PPV-1234567.mp4")
 
     return VideoFile(
         file_path=file_path,
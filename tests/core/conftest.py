@@ -0,0 +1,28 @@
+"""Fixtures shared by the core tests."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def make_video():
+    """Return a factory creating a stand-in video file at a given size.
+
+    Files are sized with ftruncate (zero-filled, one open/close pair) or
+    hardlinked to link_to, so only use it where content does not matter.
+    """
+
+    def _make_video(path: Path, size: int = 0, link_to: Path | None = None) -> Path:
+        if link_to is not None:
+            os.link(link_to, path)
+            return path
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+        return path
+
+    return _make_video
@@ -1,140 +1,294 @@
 """Test name analysis functionality."""
 
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from taggrr.config.settings import PatternConfig, SourcePatternConfig
+from taggrr.core.analyzer import IDExtractor
 from taggrr.core.analyzer_config import (
     ConfigurableIDExtractor,
     ConfigurableNameAnalyzer,
     ConfigurableSourceDetector,
+    _required_literal,
 )
 from taggrr.core.models import SourceType, VideoFile
 
 
-class TestConfigurableIDExtractor:
-    """Test ID extraction functionality."""
+@pytest.fixture(scope="module")
+def id_extractor(test_config):
+    """Create one ID extractor shared by the module's read-only tests."""
+    return ConfigurableIDExtractor(test_config)
 
-    def test_extract_fc2_ids(self, test_config):
-        """Test FC2 ID extraction."""
-        extractor = ConfigurableIDExtractor(test_config)
 
-        test_cases = [
-            "FC2-PPV-1234567",
-            "fc2-ppv-7654321",
-            "FC2PPV-9999999",
-            "ppv-1111111",
-        ]
+@pytest.fixture(scope="module")
+def source_detector(test_config):
+    """Create one source detector shared by the module's read-only tests."""
+    return ConfigurableSourceDetector(test_config)
 
-        for test_text in test_cases:
-            ids = extractor.extract_ids(test_text)
-            assert len(ids) >= 1
 
-            # Should extract some form of FC2 ID
-            fc2_ids = [id_tuple for id_tuple in ids if id_tuple[1] == SourceType.FC2]
-            assert len(fc2_ids) >= 1
+@pytest.fixture(scope="module")
+def analyzer(test_config):
+    """Create one name analyzer shared by the module's read-only tests."""
+    return ConfigurableNameAnalyzer(test_config)
 
-            # Should have high confidence for explicit FC2 patterns
-            if "FC2-PPV-" in test_text.upper():
-                assert fc2_ids[0][2] >= 0.90
 
-    def test_extract_dmm_ids(self, test_config):
-        """Test DMM ID extraction."""
-        extractor = ConfigurableIDExtractor(test_config)
+@pytest.fixture(scope="module")
+def folder_weighted_analyzer(test_config):
+    """Create an analyzer whose config prefers folder-name matches."""
+    config = test_config.model_copy(deep=True)
+    config.matching.name_analysis.folder_weight = 0.8
+    config.matching.name_analysis.file_weight = 0.2
+    return ConfigurableNameAnalyzer(config)
 
-        test_cases = ["MIDE-123", "SSNI-456", "ABP789", "123456_001"]
 
-        for test_text in test_cases:
-            ids = extractor.extract_ids(test_text)
-            assert len(ids) >= 1
+class _FakeAhoCorasick:
+    """Minimal stand-in for the optional pyahocorasick module."""
 
-            # Should extract the ID
-            extracted_id = ids[0][0]
-            assert extracted_id in test_text or test_text in extracted_id
+    class Automaton:
+        def __init__(self):
+            self._words = {}
 
-    def test_extract_no_ids(self, test_config):
-        """Test text with no recognizable IDs."""
-        extractor = ConfigurableIDExtractor(test_config)
+        def add_word(self, key, value):
+            self._words[key] = value
 
-        test_cases = ["just_a_movie_title", "no-numbers-here", "random text"]
+        def make_automaton(self):
+            pass
 
-        for test_text in test_cases:
-            ids = extractor.extract_ids(test_text)
-            # Might find weak patterns, but should be low confidence
-            if ids:
-                assert ids[0][2] <= 0.6
+        def iter(self, text):
+            for key, value in self._words.items():
+                start = text.find(key)
+                while start != -1:
+                    yield start + len(key) - 1, value
+                    start = text.find(key, start + 1)
 
 
-class TestConfigurableSourceDetector:
-    """Test source detection functionality."""
+def _video_file(file_path: Path) -> VideoFile:
+    """Build a VideoFile whose names come from its (virtual) path."""
+    return VideoFile(
+        file_path=file_path,
+        folder_name=file_path.parent.name,
+        file_name=file_path.name,
+        detected_parts=[],
+        source_hints=[],
+    )
 
-    def test_detect_fc2_sources(self, test_config):
-        """Test FC2 source detection."""
-        detector = ConfigurableSourceDetector(test_config)
 
-        test_cases = [
-            ("[FC2] Video Title", "folder:[FC2]"),
-            ("FC2-PPV-1234567.mp4", "file:FC2-*"),
-            ("some ppv video", "file:*ppv*"),
-            ("folder with fc2 content", "folder:*fc2*"),
+class TestConfigurableIDExtractor:
+    """Test ID extraction functionality."""
+
+    @pytest.mark.parametrize(
+        "test_text",
+        ["FC2-PPV-1234567", "fc2-ppv-7654321", "FC2PPV-9999999", "ppv-1111111"],
+    )
+    def test_extract_fc2_ids(self, id_extractor, test_text):
+        """Test FC2 ID extraction."""
+        ids = id_extractor.extract_ids(test_text)
+        assert len(ids) >= 1
+
+        # Should extract some form of FC2 ID
+        fc2_ids = [id_tuple for id_tuple in ids if id_tuple[1] == SourceType.FC2]
+        assert len(fc2_ids) >= 1
+
+        # Should have high confidence for explicit FC2 patterns
+        if "FC2-PPV-" in test_text.upper():
+            assert fc2_ids[0][2] >= 0.90
+
+    @pytest.mark.parametrize(
+        "test_text", ["MIDE-123", "SSNI-456", "ABP789", "123456_001"]
+    )
+    def test_extract_dmm_ids(self, id_extractor, test_text):
+        """Test DMM ID extraction."""
+        ids = id_extractor.extract_ids(test_text)
+        assert len(ids) >= 1
+
+        # Should extract the ID
+        extracted_id = ids[0][0]
+        assert extracted_id in test_text or test_text in extracted_id
+
+    @pytest.mark.parametrize(
+        "test_text", ["just_a_movie_title", "no-numbers-here", "random text"]
+    )
+    def test_extract_no_ids(self, id_extractor, test_text):
+        """Test text with no recognizable IDs."""
+        ids = id_extractor.extract_ids(test_text)
+        # Might find weak patterns, but should be low confidence
+        if ids:
+            assert ids[0][2] <= 0.6
+
+    def test_union_prefilter_matches_per_pattern_scan(self, test_config):
+        """Test the fused prefilter never changes extraction results."""
+        extractor = ConfigurableIDExtractor(test_config)
+        unfiltered = ConfigurableIDExtractor(test_config)
+        unfiltered._tiers = [(patterns, None) for patterns, _ in unfiltered._tiers]
+
+        for text in [
+            "FC2-PPV-1234567 Premium",
+            "[DMM] Random Folder",
+            "MIDE-123 and ABP789",
+            "no-numbers-here",
+            "20240101",
+        ]:
+            assert extractor.extract_ids(text) == unfiltered.extract_ids(text)
+
+    def test_union_prefilter_skipped_for_backreferences(self, test_config_mut):
+        """Test patterns with group references fall back to per-pattern scans."""
+        test_config_mut.id_extraction.strong_patterns = [
+            PatternConfig(regex=r"(\d)\1(\d{4})", format="{}", confidence=0.9),
         ]
+        extractor = ConfigurableIDExtractor(test_config_mut)
+
+        _, strong_union = extractor._tiers[0]
+        assert strong_union is None
+        assert extractor.extract_ids("x1123456")[0][2] == 0.9
+
+    @pytest.mark.parametrize(
+        ("regex", "expected"),
+        [
+            (r"FC2-PPV-(\d{6,8})", "fc2-ppv-"),
+            (r".*-h.mp4", "mp4"),
+            (r"([A-Z]{2,5}-\d{3,4})", None),  # Only a single literal "-"
+            (r"(abcd)?x", None),  # Optional text is not required
+            (r"(?:foo|bar)baz", "baz"),
+        ],
+    )
+    def test_required_literal(self, regex, expected):
+        """Test the literal prefilter only uses text every match contains."""
+        assert _required_literal(re.compile(regex, re.IGNORECASE)) == expected
+
+
+class TestIDExtractor:
+    """Test the built-in (non-configurable) ID extractor."""
+
+    @pytest.mark.parametrize("use_automaton", [False, True])
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("[BT]102116_410-1pon-1080p", "102116_410"),
+            ("1Pondo 100915_3257", "100915_3257"),
+            ("121616_005-caribpr-1080p", "121616_005"),
+            ("CarribeanPR 21418_003", "21418_003"),
+            ("FC2-PPV-1234567", "1234567"),
+            ("MIDE-123", "MIDE-123"),
+        ],
+    )
+    def test_provider_markers_gate_strong_patterns(self, use_automaton, text, expected):
+        """Test marker prefiltering keeps the same first ID either way."""
+        fake = _FakeAhoCorasick if use_automaton else None
+        with patch("taggrr.core.analyzer.ahocorasick", fake):
+            extractor = IDExtractor()
+        assert (extractor._automaton is not None) is use_automaton
+        assert extractor.extract_ids(text)[0][0] == expected
+
+    def test_repeated_text_is_memoized(self):
+        """Test repeated names reuse the cached result without sharing lists."""
+        extractor = IDExtractor()
+        first = extractor.extract_ids("MIDE-123.mp4")
+        first.clear()
+
+        assert extractor.extract_ids("MIDE-123.mp4")[0][0] == "MIDE-123"
+        assert extractor._extract_cached.cache_info().hits == 1
+
 
-        for test_text, expected_pattern_type in test_cases:
-            hints = detector.detect_sources(test_text)
+class TestConfigurableSourceDetector:
+    """Test source detection functionality."""
 
-            fc2_hints = [h for h in hints if h.source_type == SourceType.FC2]
-            assert len(fc2_hints) >= 1
+    @pytest.mark.parametrize(
+        "test_text",
+        [
+            "[FC2] Video Title",
+            "FC2-PPV-1234567.mp4",
+            "some ppv video",
+            "folder with fc2 content",
+        ],
+    )
+    def test_detect_fc2_sources(self, source_detector, test_text):
+        """Test FC2 source detection."""
+        hints = source_detector.detect_sources(test_text)
 
-            # Should have positive confidence boost
-            assert fc2_hints[0].confidence_boost > 0
+        fc2_hints = [h for h in hints if h.source_type == SourceType.FC2]
+        assert len(fc2_hints) >= 1
 
-    def test_detect_dmm_sources(self, test_config):
-        """Test DMM source detection."""
-        detector = ConfigurableSourceDetector(test_config)
+        # Should have positive confidence boost
+        assert fc2_hints[0].confidence_boost > 0
 
-        test_cases = [
+    @pytest.mark.parametrize(
+        "test_text",
+        [
             "[DMM] Movie Title",
             "[R18] Another Title",
             "movie-h.mp4",
             "uncensored version",
-        ]
-
-        for test_text in test_cases:
-            hints = detector.detect_sources(test_text)
+        ],
+    )
+    def test_detect_dmm_sources(self, source_detector, test_text):
+        """Test DMM source detection."""
+        hints = source_detector.detect_sources(test_text)
 
-            dmm_hints = [h for h in hints if h.source_type == SourceType.DMM]
-            assert len(dmm_hints) >= 1
-            assert dmm_hints[0].confidence_boost > 0
+        dmm_hints = [h for h in hints if h.source_type == SourceType.DMM]
+        assert len(dmm_hints) >= 1
+        assert dmm_hints[0].confidence_boost > 0
 
-    def test_detect_multiple_sources(self, test_config):
+    def test_detect_multiple_sources(self, source_detector):
         """Test detection of multiple source hints."""
-        detector = ConfigurableSourceDetector(test_config)
-
         # Text with both FC2 and DMM indicators
         test_text = "[DMM] FC2-PPV-1234567"
-        hints = detector.detect_sources(test_text)
+        hints = source_detector.detect_sources(test_text)
 
         source_types = {h.source_type for h in hints}
         assert SourceType.FC2 in source_types
         assert SourceType.DMM in source_types
 
+    @pytest.mark.parametrize("use_automaton", [False, True])
+    def test_literal_markers_match_regex_globs(self, test_config, use_automaton):
+        """Test literal-marker matching agrees with the glob regexes."""
+        fake = _FakeAhoCorasick if use_automaton else None
+        with patch("taggrr.core.analyzer_config.ahocorasick", fake):
+            detector = ConfigurableSourceDetector(test_config)
+        assert (detector._automaton is not None) is use_automaton
+
+        regex_only = ConfigurableSourceDetector(test_config)
+        regex_only._automaton = None
+        regex_only.compiled_patterns = {
+            source: [
+                (regex, None, None, text, boost)
+                for regex, _, _, text, boost in patterns
+            ]
+            for source, patterns in regex_only.compiled_patterns.items()
+        }
+
+        for text in [
+            "[DMM] FC2-PPV-1234567",
+            "movie-h.mp4",
+            "movie-hXmp4",
+            "Uncensored PPV",
+            "plain title",
+        ]:
+            assert detector.detect_sources(text) == regex_only.detect_sources(text)
+
+    @pytest.mark.parametrize("use_automaton", [False, True])
+    def test_interior_wildcard_glob_spans_text(self, test_config_mut, use_automaton):
+        """Test a "*" between words still matches the text between them."""
+        test_config_mut.source_detection.patterns = {
+            "fc2": SourcePatternConfig(folder=["fc2*uncensored"]),
+        }
+        fake = _FakeAhoCorasick if use_automaton else None
+        with patch("taggrr.core.analyzer_config.ahocorasick", fake):
+            detector = ConfigurableSourceDetector(test_config_mut)
+
+        hints = detector.detect_sources("FC2 Something Uncensored")
+        assert [h.pattern_matched for h in hints] == ["folder:fc2*uncensored"]
+        assert detector.detect_sources("uncensored fc2") == []
+
 
 class TestConfigurableNameAnalyzer:
     """Test the complete name analysis engine."""
 
-    def test_analyze_fc2_video(self, test_config, temp_dir):
+    def test_analyze_fc2_video(self, analyzer, fixture_tree):
         """Test analysis of FC2 video file."""
-        analyzer = ConfigurableNameAnalyzer(test_config)
-
-        # Create test file
-        folder_path = temp_dir / "FC2-PPV-1234567 Premium"
-        folder_path.mkdir()
-        file_path = folder_path / "FC2-PPV-1234567.mp4"
-        file_path.touch()
-
-        video_file = VideoFile(
-            file_path=file_path,
-            folder_name="FC2-PPV-1234567 Premium",
-            file_name="FC2-PPV-1234567.mp4",
-            detected_parts=[],
-            source_hints=[],
-        )
+        video_file = _video_file(fixture_tree.fc2_file)
 
         result = analyzer.analyze(video_file)
 
@@ -143,22 +297,9 @@ class TestConfigurableNameAnalyzer:
         assert any(h.source_type == SourceType.FC2 for h in result.source_hints)
         assert result.confidence_scores["combined"] > 0.5
 
-    def test_analyze_dmm_video(self, test_config, temp_dir):
+    def test_analyze_dmm_video(self, analyzer, fixture_tree):
         """Test analysis of DMM video file."""
-        analyzer = ConfigurableNameAnalyzer(test_config)
-
-        folder_path = temp_dir / "[DMM] Random Folder"
-        folder_path.mkdir()
-        file_path = folder_path / "MIDE-123.mp4"
-        file_path.touch()
-
-        video_file = VideoFile(
-            file_path=file_path,
-            folder_name="[DMM] Random Folder",
-            file_name="MIDE-123.mp4",
-            detected_parts=[],
-            source_hints=[],
-        )
+        video_file = _video_file(fixture_tree.dmm_file)
 
         result = analyzer.analyze(video_file)
 
@@ -166,22 +307,9 @@ class TestConfigurableNameAnalyzer:
         assert len(result.source_hints) >= 1
         assert any(h.source_type == SourceType.DMM for h in result.source_hints)
 
-    def test_analyze_conflicting_sources(self, test_config, temp_dir):
+    def test_analyze_conflicting_sources(self, analyzer, fixture_tree):
         """Test analysis when folder and filename suggest different sources."""
-        analyzer = ConfigurableNameAnalyzer(test_config)
-
-        folder_path = temp_dir / "[DMM] Folder"
-        folder_path.mkdir()
-        file_path = folder_path / "FC2-PPV-1234567.mp4"
-        file_path.touch()
-
-        video_file = VideoFile(
-            file_path=file_path,
-            folder_name="[DMM] Folder",
-            file_name="FC2-PPV-1234567.mp4",
-            detected_parts=[],
-            source_hints=[],
-        )
+        video_file = _video_file(fixture_tree.conflict_file)
 
         result = analyzer.analyze(video_file)
 
@@ -196,48 +324,18 @@ class TestConfigurableNameAnalyzer:
         # Filename should win due to stronger ID pattern
         assert result.extraction_source == "filename"
 
-    def test_folder_vs_filename_weighting(self, test_config, temp_dir):
+    def test_folder_vs_filename_weighting(self, folder_weighted_analyzer, fixture_tree):
         """Test configurable folder vs filename weighting."""
-        # Test with folder preference
-        test_config.matching.name_analysis.folder_weight = 0.8
-        test_config.matching.name_analysis.file_weight = 0.2
-
-        analyzer = ConfigurableNameAnalyzer(test_config)
-
-        folder_path = temp_dir / "CLEAR-ID-123 Folder"
-        folder_path.mkdir()
-        file_path = folder_path / "cryptic_filename.mp4"
-        file_path.touch()
+        video_file = _video_file(fixture_tree.weighted_file)
 
-        video_file = VideoFile(
-            file_path=file_path,
-            folder_name="CLEAR-ID-123 Folder",
-            file_name="cryptic_filename.mp4",
-            detected_parts=[],
-            source_hints=[],
-        )
-
-        result = analyzer.analyze(video_file)
+        result = folder_weighted_analyzer.analyze(video_file)
 
         # Should prefer folder-based extraction due to weighting
         assert result.confidence_scores["folder"] > result.confidence_scores["filename"]
 
-    def test_year_extraction(self, test_config, temp_dir):
+    def test_year_extraction(self, analyzer, fixture_tree):
         """Test year extraction from folder/filename."""
-        analyzer = ConfigurableNameAnalyzer(test_config)
-
-        folder_path = temp_dir / "Movie Title (2024)"
-        folder_path.mkdir()
-        file_path = folder_path / "movie.mp4"
-        file_path.touch()
-
-        video_file = VideoFile(
-            file_path=file_path,
-            folder_name="Movie Title (2024)",
-            file_name="movie.mp4",
-            detected_parts=[],
-            source_hints=[],
-        )
+        video_file = _video_file(fixture_tree.year_file)
 
         result = analyzer.analyze(video_file)
 
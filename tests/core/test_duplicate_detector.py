@@ -2,11 +2,15 @@
 
 import os
 
+import pytest
+
 from taggrr.core.duplicate_detector import (
+    PARTIAL_HASH_SAMPLE,
     DuplicateDetector,
     _group_files_by_inode,
     are_hardlinks,
     compute_hash,
+    compute_partial_hash,
     get_unmatched_files,
 )
 from taggrr.core.models import SourceType, VideoFile
@@ -44,7 +48,7 @@ class TestHardlinkDetection:
 
 
 class TestComputeHash:
-    """Test SHA256 hash computation."""
+    """Test content hash computation."""
 
     def test_identical_content_same_hash(self, temp_dir):
         content = b"video data"
@@ -59,6 +63,30 @@ class TestComputeHash:
         f2.write_bytes(b"content B")
         assert compute_hash(f1) != compute_hash(f2)
 
+    def test_chunk_size_does_not_change_hash(self, temp_dir):
+        f = temp_dir / "file.mp4"
+        f.write_bytes(b"0123456789" * 10)
+        assert compute_hash(f, chunk_size=7) == compute_hash(f)
+
+    def test_empty_file_is_hashed(self, temp_dir):
+        """Empty files can't be memory-mapped but still hash consistently."""
+        f1, f2 = temp_dir / "a.mp4", temp_dir / "b.mp4"
+        f1.write_bytes(b"")
+        f2.write_bytes(b"")
+        assert compute_hash(f1) == compute_hash(f2)
+        assert len(compute_hash(f1)) == 64
+
+    def test_partial_hash_samples_start_middle_and_end(self, temp_dir):
+        size = 4 * PARTIAL_HASH_SAMPLE
+        base = temp_dir / "base.mp4"
+        base.write_bytes(bytes(size))
+        for offset in (0, size // 2, size - 1):
+            changed = bytearray(size)
+            changed[offset] = 1
+            f = temp_dir / f"changed_{offset}.mp4"
+            f.write_bytes(changed)
+            assert compute_partial_hash(f) != compute_partial_hash(base)
+
     def test_result_is_valid_hex_string(self, temp_dir):
         f = temp_dir / "file.mp4"
         f.write_bytes(b"some data")
@@ -108,18 +136,40 @@ class TestIdNormalization:
         assert len(sets) == 1
         assert sets[0].source_type == SourceType.DMM
 
+    def test_normalize_id_matches_upper_and_strip(self):
+        """Normalization equals upper() with dashes/underscores removed."""
+        detector = DuplicateDetector()
+        for video_id in ("mide-123", "Fc2_PPV-1234567", "ébc-12", "ABC123"):
+            expected = video_id.upper().replace("-", "").replace("_", "")
+            assert detector._normalize_id(video_id) == expected
+
+    def test_normalized_ids_are_interned(self):
+        """Equal normalized IDs are the same string object."""
+        detector = DuplicateDetector()
+        assert detector._normalize_id("mide-123") is detector._normalize_id("MIDE_123")
+
 
 class TestDuplicateDetector:
     """Core duplicate detection behaviour."""
 
-    def test_fc2_pattern_matching(self, temp_dir):
+    def test_instances_share_compiled_patterns(self):
+        """Constructing a detector does not recompile its regexes."""
+        a, b = DuplicateDetector(), DuplicateDetector()
+        assert a.id_extractor.strong_patterns is b.id_extractor.strong_patterns
+        assert (
+            a.scanner.part_detector.compiled_patterns
+            is b.scanner.part_detector.compiled_patterns
+        )
+
+    @pytest.mark.fake_fs
+    def test_fc2_pattern_matching(self, temp_dir, make_video):
         """FC2-PPV files detected by ID across directories."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
-        (source / "fc2-ppv-1234567.mp4").write_bytes(b"video")
-        (target / "FC2-PPV-1234567.mp4").write_bytes(b"copy")
+        make_video(source / "fc2-ppv-1234567.mp4")
+        make_video(target / "FC2-PPV-1234567.mp4")
 
         sets = DuplicateDetector().scan_multiple(source, [target])
 
@@ -128,16 +178,17 @@ class TestDuplicateDetector:
         assert sets[0].confidence >= 0.80
         assert sets[0].match_type == "name"
 
-    def test_multiple_targets(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_multiple_targets(self, temp_dir, make_video):
         """A single source file duplicated across two targets produces one set."""
         source = temp_dir / "source"
         target1 = temp_dir / "target1"
         target2 = temp_dir / "target2"
         for d in (source, target1, target2):
             d.mkdir()
-        (source / "ABC-123.mp4").write_bytes(b"video")
-        (target1 / "ABC-123.mp4").write_bytes(b"copy 1")
-        (target2 / "ABC-123.mp4").write_bytes(b"copy 2")
+        make_video(source / "ABC-123.mp4")
+        make_video(target1 / "ABC-123.mp4")
+        make_video(target2 / "ABC-123.mp4")
 
         sets = DuplicateDetector().scan_multiple(source, [target1, target2])
 
@@ -148,30 +199,33 @@ class TestDuplicateDetector:
         assert s.source_file.file_path.parent.resolve() == source.resolve()
         assert len(s.copy_pairs) == 2
 
-    def test_source_only_file_not_reported(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_source_only_file_not_reported(self, temp_dir, make_video):
         """Files that exist only in the source dir are not reported."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
-        (source / "ABC-123.mp4").write_bytes(b"video A")
-        (source / "XYZ-999.mp4").write_bytes(b"video B")  # source-only
-        (target / "ABC-123.mp4").write_bytes(b"copy A")
+        make_video(source / "ABC-123.mp4")
+        make_video(source / "XYZ-999.mp4")  # source-only
+        make_video(target / "ABC-123.mp4")
 
         sets = DuplicateDetector().scan_multiple(source, [target])
         assert len(sets) == 1
 
-    def test_no_matches_returns_empty(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_no_matches_returns_empty(self, temp_dir, make_video):
         """Non-matching files produce no duplicate sets."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
-        (source / "ABC-123.mp4").write_bytes(b"video")
-        (target / "XYZ-999.mp4").write_bytes(b"video")
+        make_video(source / "ABC-123.mp4")
+        make_video(target / "XYZ-999.mp4")
 
         assert DuplicateDetector().scan_multiple(source, [target]) == []
 
+    @pytest.mark.fake_fs
     def test_empty_directories(self, temp_dir):
         """Empty directories produce no results."""
         source = temp_dir / "source"
@@ -181,7 +235,47 @@ class TestDuplicateDetector:
 
         assert DuplicateDetector().scan_multiple(source, [target]) == []
 
-    def test_hardlink_detected_as_hardlink(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_empty_source_skips_target_scan(self, temp_dir, make_video):
+        """Without content matching, an empty source never scans targets."""
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        make_video(target / "ABC-123.mp4")
+
+        detector = DuplicateDetector()
+        scanned = []
+        scan_directory = detector.scanner.scan_directory
+
+        def recording_scan(path):
+            scanned.append(path)
+            return scan_directory(path)
+
+        detector.scanner.scan_directory = recording_scan
+        assert detector.scan_multiple(source, [target]) == []
+        assert scanned == [source]
+
+    def test_parallel_directory_scan_matches_serial(self, temp_dir, make_video):
+        """Scanning targets on several threads gives the same sets as serially."""
+        source = temp_dir / "source"
+        targets = [temp_dir / f"target{i}" for i in range(3)]
+        for d in (source, *targets):
+            d.mkdir()
+            make_video(d / "ABC-123.mp4")
+        make_video(source / "XYZ-999.mp4")
+        make_video(targets[1] / "XYZ-999.mp4")
+
+        detector = DuplicateDetector()
+        serial = detector.scan_multiple(source, targets, workers=1)
+        parallel = detector.scan_multiple(source, targets, workers=4)
+
+        assert [s.video_id for s in parallel] == [s.video_id for s in serial]
+        assert [list(s.files_by_dir) for s in parallel] == [
+            list(s.files_by_dir) for s in serial
+        ]
+
+    def test_hardlink_detected_as_hardlink(self, temp_dir, make_video):
         """A hardlinked target file is classified as HARDLINK."""
         source = temp_dir / "source"
         target = temp_dir / "target"
@@ -189,8 +283,8 @@ class TestDuplicateDetector:
         target.mkdir()
 
         src_file = source / "fc2-ppv-111111.mp4"
-        src_file.write_bytes(b"x" * 1000)
-        os.link(src_file, target / "FC2-PPV-111111.mp4")
+        make_video(src_file, 1000)
+        make_video(target / "FC2-PPV-111111.mp4", link_to=src_file)
 
         sets = DuplicateDetector().scan_multiple(source, [target])
 
@@ -201,14 +295,14 @@ class TestDuplicateDetector:
         assert len(s.copy_pairs) == 0
         assert s.wasted_space == 0
 
-    def test_copy_status_and_wasted_space(self, temp_dir):
+    def test_copy_status_and_wasted_space(self, temp_dir, make_video):
         """A true copy is COPY status; wasted_space = copy file size."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
-        (source / "ABC-456.mp4").write_bytes(b"x" * 1500)
-        (target / "abc-456.mp4").write_bytes(b"x" * 1500)
+        make_video(source / "ABC-456.mp4", 1500)
+        make_video(target / "abc-456.mp4", 1500)
 
         sets = DuplicateDetector().scan_multiple(source, [target])
 
@@ -218,7 +312,7 @@ class TestDuplicateDetector:
         # wasted_space is the target (copy) file size, not the source size
         assert s.wasted_space == 1500
 
-    def test_mixed_hardlink_and_copy(self, temp_dir):
+    def test_mixed_hardlink_and_copy(self, temp_dir, make_video):
         """When source has multiple target copies, some HL and some copy → MIXED."""
         source = temp_dir / "source"
         target1 = temp_dir / "target1"
@@ -227,9 +321,9 @@ class TestDuplicateDetector:
             d.mkdir()
 
         src_file = source / "ABC-789.mp4"
-        src_file.write_bytes(b"x" * 2000)
-        os.link(src_file, target1 / "ABC-789.mp4")         # hardlink
-        (target2 / "ABC-789.mp4").write_bytes(b"x" * 2000)  # true copy
+        make_video(src_file, 2000)
+        make_video(target1 / "ABC-789.mp4", link_to=src_file)  # hardlink
+        make_video(target2 / "ABC-789.mp4", 2000)  # true copy
 
         sets = DuplicateDetector().scan_multiple(source, [target1, target2])
 
@@ -240,42 +334,45 @@ class TestDuplicateDetector:
         assert len(s.copy_pairs) == 1
         assert s.wasted_space == 2000  # only the copy wastes space
 
-    def test_confidence_threshold_filtering(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_confidence_threshold_filtering(self, temp_dir, make_video):
         """Low-confidence matches are filtered by min_confidence."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
         # Generic 8-digit pattern has low confidence (~0.40)
-        (source / "12345678.mp4").write_bytes(b"video")
-        (target / "12345678.mkv").write_bytes(b"video")
+        make_video(source / "12345678.mp4")
+        make_video(target / "12345678.mkv")
 
         detector = DuplicateDetector()
         assert len(detector.scan_multiple(source, [target], min_confidence=0.7)) == 0
         assert len(detector.scan_multiple(source, [target], min_confidence=0.3)) == 1
 
-    def test_output_sorted_deterministically(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_output_sorted_deterministically(self, temp_dir, make_video):
         """Sets are returned in a consistent, sorted order."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
         for name in ("ZZZ-999.mp4", "AAA-001.mp4", "MMM-500.mp4"):
-            (source / name).write_bytes(b"video")
-            (target / name).write_bytes(b"copy")
+            make_video(source / name)
+            make_video(target / name)
 
         sets = DuplicateDetector().scan_multiple(source, [target])
         ids = [s.video_id for s in sets]
         assert ids == sorted(ids)
 
-    def test_source_file_points_to_source_dir(self, temp_dir):
+    @pytest.mark.fake_fs
+    def test_source_file_points_to_source_dir(self, temp_dir, make_video):
         """The source_file in each set points to the file in the source directory."""
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
         target.mkdir()
-        (source / "ABC-123.mp4").write_bytes(b"video")
-        (target / "ABC-123.mp4").write_bytes(b"copy")
+        make_video(source / "ABC-123.mp4")
+        make_video(target / "ABC-123.mp4")
 
         sets = DuplicateDetector().scan_multiple(source, [target])
         assert sets[0].source_file is not None
@@ -283,7 +380,7 @@ class TestDuplicateDetector:
 
 
 class TestContentMatching:
-    """Content-based (size + SHA256) duplicate detection."""
+    """Content-based (size + content hash) duplicate detection."""
 
     def test_content_match_finds_identical_unnamed_files(self, temp_dir):
         """Files with the same content but no ID match are found via --content-match."""
@@ -334,6 +431,30 @@ class TestContentMatching:
         assert sets[0].file_hash is not None
         assert sets[0].file_size == 5000
 
+    def test_name_match_hardlinks_not_rehashed(self, temp_dir, monkeypatch):
+        """Hardlinks of the source confirm a name set without being hashed."""
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "ABC-123.mp4").write_bytes(b"x" * 5000)
+        os.link(source / "ABC-123.mp4", target / "ABC-123.mp4")
+        (target / "abc_123.mp4").write_bytes(b"x" * 5000)
+        os.link(target / "abc_123.mp4", target / "ABC123.mp4")
+
+        hashed = []
+        detector = DuplicateDetector()
+        real_hash = detector._hash
+        monkeypatch.setattr(
+            detector, "_hash", lambda p: hashed.append(p) or real_hash(p)
+        )
+        sets = detector.scan_multiple(source, [target], content_match=True)
+
+        assert len(sets) == 1
+        assert sets[0].match_type == "name+content"
+        # The source, plus one path for the separate copy's inode
+        assert len(hashed) == 2
+
     def test_name_match_with_different_content_stays_name(self, temp_dir):
         """Name-matched files with different content stay as name-only match."""
         source = temp_dir / "source"
@@ -382,6 +503,86 @@ class TestContentMatching:
         no_source = [s for s in sets if s.status == "NO_SOURCE"]
         assert len(no_source) >= 1
 
+    def test_partial_hash_skips_full_hash_of_mismatched_files(
+        self, temp_dir, monkeypatch
+    ):
+        """Same-size large files with different samples are never fully read."""
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        size = 4 * PARTIAL_HASH_SAMPLE
+        content = bytes(size)
+        (source / "alpha.mp4").write_bytes(content)
+        (target / "beta.mp4").write_bytes(content)
+        (target / "gamma.mp4").write_bytes(content[:-1] + b"x")
+
+        hashed = []
+        detector = DuplicateDetector()
+        real_hash = detector._hash
+        monkeypatch.setattr(
+            detector, "_hash", lambda p: hashed.append(p.name) or real_hash(p)
+        )
+        sets = detector.scan_multiple(
+            source, [target], min_confidence=1.0, content_match=True
+        )
+
+        assert [sorted(f.file_name for f in s.all_files) for s in sets] == [
+            ["alpha.mp4", "beta.mp4"]
+        ]
+        assert sorted(hashed) == ["alpha.mp4", "beta.mp4"]
+
+    def test_parallel_hashing_matches_serial(self, temp_dir):
+        """Threaded hashing finds the same content sets as workers=1."""
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        sources = ["apple", "banana", "cherry", "damson", "elder", "fig"]
+        targets = ["kiwi", "lemon", "mango", "nectarine", "olive", "peach"]
+        for i, (src, tgt) in enumerate(zip(sources, targets)):
+            (source / f"{src}.mp4").write_bytes(b"payload %d" % i)
+            (target / f"{tgt}.mp4").write_bytes(b"payload %d" % (i % 3))
+
+        def summary(workers):
+            # min_confidence=1.0 leaves every file to content matching
+            sets = DuplicateDetector().scan_multiple(
+                source,
+                [target],
+                min_confidence=1.0,
+                content_match=True,
+                workers=workers,
+            )
+            return [
+                (s.file_hash, sorted(f.file_name for f in s.all_files)) for s in sets
+            ]
+
+        assert summary(4) == summary(1)
+        assert len(summary(4)) == 3
+
+    def test_content_match_hashes_once_per_inode(self, temp_dir, monkeypatch):
+        """Unique sizes are never hashed; hardlinked copies are hashed once."""
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "random_a.mp4").write_bytes(b"shared content")
+        os.link(source / "random_a.mp4", target / "random_b.mp4")
+        (target / "other_size.mp4").write_bytes(b"a different length")
+
+        hashed = []
+        detector = DuplicateDetector()
+        real_hash = detector._hash
+        monkeypatch.setattr(
+            detector, "_hash", lambda p: hashed.append(p) or real_hash(p)
+        )
+        sets = detector.scan_multiple(source, [target], content_match=True)
+
+        assert len(sets) == 1
+        assert sets[0].status == "HARDLINK"
+        assert len(sets[0].all_files) == 2
+        assert len(hashed) == 1
+
 
 class TestPartAwareMatching:
     """Part-aware duplicate grouping by filename suffixes."""
@@ -605,6 +806,36 @@ class TestInodeChains:
         sizes = sorted(len(g) for g in groups)
         assert sizes == [1, 2]
 
+    def test_build_set_pairs_by_scanned_identity(self, temp_dir):
+        """Hardlink/copy pairing compares recorded inodes without stat calls."""
+        src_dir, tgt_dir = temp_dir / "src", temp_dir / "tgt"
+        source = VideoFile(src_dir / "a.mp4", "src", "a.mp4", st_dev=1, st_ino=7)
+        linked = VideoFile(tgt_dir / "b.mp4", "tgt", "b.mp4", st_dev=1, st_ino=7)
+        copied = VideoFile(tgt_dir / "c.mp4", "tgt", "c.mp4", st_dev=1, st_ino=8)
+
+        dup_set = DuplicateDetector()._build_set(
+            match_type="name",
+            video_id="ABC123",
+            confidence=0.9,
+            source_type=SourceType.DMM,
+            file_size=None,
+            file_hash=None,
+            files_by_dir={src_dir: [source], tgt_dir: [linked, copied]},
+            source_file=source,
+            source_dir=src_dir,
+        )
+        assert dup_set.hardlink_pairs == [(source, linked)]
+        assert dup_set.copy_pairs == [(source, copied)]
+
+    def test_group_files_by_inode_uses_scanned_identity(self, temp_dir):
+        """Scanned files are grouped by their recorded inode without a stat."""
+        missing = temp_dir / "gone.mp4"  # stat() would fail
+        files = [
+            VideoFile(missing, "d", "gone.mp4", st_dev=1, st_ino=42),
+            VideoFile(missing, "d", "gone.mp4", st_dev=1, st_ino=42),
+        ]
+        assert len(_group_files_by_inode(files)) == 1
+
 
 class TestUnmatchedFiles:
     """Utility for retrieving files not included in any duplicate set."""
@@ -634,3 +865,12 @@ class TestUnmatchedFiles:
 
         assert len(unmatched) == 1
         assert unmatched[0].file_path == temp_dir / "file2.mp4"
+
+    def test_get_unmatched_files_accepts_any_iterable(self, temp_dir):
+        files = [
+            VideoFile(temp_dir / f"file{i}.mp4", "test", f"file{i}.mp4")
+            for i in range(3)
+        ]
+        matched = (f.file_path for f in files[:2])  # one-shot generator
+        unmatched = get_unmatched_files(files, matched)
+        assert [f.file_name for f in unmatched] == ["file2.mp4"]
@@ -64,6 +64,7 @@ class TestPlexFormatter:
             ('Title"With/Quotes\\', "Title_With_Quotes_"),
             ("   Leading/Trailing Spaces   ", "Leading_Trailing Spaces"),
             ("Title.", "Title"),  # Trailing dot removal
+            ("Star*Title", "Star_Title"),
         ]
 
         for input_name, expected in test_cases:
@@ -91,6 +92,16 @@ class TestPlexFormatter:
         assert len(result) <= 200
         assert result == "A" * 200
 
+    def test_repeated_names_reuse_sanitized_result(
+        self, test_config, sample_match_result
+    ):
+        """Test formatting the same match twice hits the sanitize cache."""
+        formatter = PlexFormatter(test_config)
+
+        first = formatter.format_folder_name(sample_match_result)
+        assert formatter.format_folder_name(sample_match_result) == first
+        assert formatter._sanitize_cached.cache_info().hits == 1
+
 
 class TestNFOGenerator:
     """Test NFO file generation."""
@@ -108,10 +119,10 @@ class TestNFOGenerator:
         assert "<year>2024</year>" in nfo_content
         assert "</movie>" in nfo_content
 
-    def test_generate_nfo_disabled(self, test_config, sample_match_result):
+    def test_generate_nfo_disabled(self, test_config_mut, sample_match_result):
         """Test NFO generation when disabled."""
-        test_config.plex_output.create_nfo = False
-        generator = NFOGenerator(test_config)
+        test_config_mut.plex_output.create_nfo = False
+        generator = NFOGenerator(test_config_mut)
 
         nfo_content = generator.generate_movie_nfo(sample_match_result)
 
@@ -0,0 +1,93 @@
+"""Tests for the persistent content hash cache."""
+
+import os
+
+from taggrr.core.duplicate_detector import DuplicateDetector, compute_hash
+from taggrr.core.hash_cache import HashCache
+
+
+class _CountingHash:
+    """compute_hash wrapper that records which files were hashed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        return compute_hash(path)
+
+
+class TestHashCache:
+    """Test digest reuse, invalidation and eviction."""
+
+    def test_reuses_digest_across_instances(self, temp_dir):
+        f = temp_dir / "a.mp4"
+        f.write_bytes(b"video data")
+        db = temp_dir / "hashes.sqlite"
+
+        with HashCache(db) as cache:
+            assert cache.get_or_compute(f, compute_hash, "sha256") == compute_hash(f)
+
+        counting = _CountingHash()
+        with HashCache(db) as cache:
+            assert cache.get_or_compute(f, counting, "sha256") == compute_hash(f)
+        assert counting.calls == []
+
+    def test_changed_file_is_rehashed(self, temp_dir):
+        f = temp_dir / "a.mp4"
+        f.write_bytes(b"before")
+        db = temp_dir / "hashes.sqlite"
+        with HashCache(db) as cache:
+            old = cache.get_or_compute(f, compute_hash, "sha256")
+
+        f.write_bytes(b"after!")
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        counting = _CountingHash()
+        with HashCache(db) as cache:
+            assert cache.get_or_compute(f, counting, "sha256") != old
+        assert counting.calls == [f]
+
+    def test_other_algorithm_is_rehashed(self, temp_dir):
+        f = temp_dir / "a.mp4"
+        f.write_bytes(b"video data")
+        db = temp_dir / "hashes.sqlite"
+        with HashCache(db) as cache:
+            cache.get_or_compute(f, compute_hash, "sha256")
+
+        counting = _CountingHash()
+        with HashCache(db) as cache:
+            cache.get_or_compute(f, counting, "blake3")
+        assert counting.calls == [f]
+
+    def test_evicts_beyond_max_entries(self, temp_dir):
+        files = []
+        for i in range(5):
+            f = temp_dir / f"{i}.mp4"
+            f.write_bytes(bytes([i]))
+            files.append(f)
+
+        with HashCache(temp_dir / "hashes.sqlite", max_entries=3) as cache:
+            for f in files:
+                cache.get_or_compute(f, compute_hash, "sha256")
+            cache.flush()
+            count = cache._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        assert count == 3
+
+    def test_detector_uses_cache(self, temp_dir):
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+        (source / "random_a.mp4").write_bytes(b"same content")
+        (target / "random_b.mp4").write_bytes(b"same content")
+
+        with HashCache(temp_dir / "hashes.sqlite") as cache:
+            detector = DuplicateDetector(hash_cache=cache)
+            sets = detector.scan_multiple(source, [target], content_match=True)
+            rows = cache._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+        assert len(sets) == 1
+        assert sets[0].match_type == "content"
+        assert rows == 2
@@ -1,7 +1,9 @@
 """Test video file scanning functionality."""
 
+import os
+
 from taggrr.core.models import VideoFile
-from taggrr.core.scanner import PartDetector, VideoScanner
+from taggrr.core.scanner import PartDetector, VideoScanner, _indel_similarity
 
 
 class TestPartDetector:
@@ -38,6 +40,31 @@ class TestPartDetector:
         parts = detector.detect_parts(file_path)
         assert len(parts) == 0
 
+    def test_indel_similarity(self):
+        """Test Indel similarity on part-stripped names."""
+        detector = PartDetector()
+
+        assert (
+            _indel_similarity(
+                detector._remove_part_indicators("movie_part_1"),
+                detector._remove_part_indicators("movie_part_2"),
+            )
+            == 1.0
+        )
+        assert _indel_similarity("", "") == 1.0
+        # 2 * LCS("abcd", "acbd") / 8 == 2 * 3 / 8
+        assert _indel_similarity("abcd", "acbd") == 0.75
+        assert _indel_similarity("abc", "xyz") == 0.0
+
+    def test_longest_common_substring(self):
+        """Test longest common substring prefers the earliest match in s1."""
+        detector = PartDetector()
+
+        assert detector._longest_common_substring("xabcy", "zzabczz") == "abc"
+        assert detector._longest_common_substring("abXcd", "cdYab") == "ab"
+        assert detector._longest_common_substring("abc", "xyz") == ""
+        assert detector._longest_common_substring("", "abc") == ""
+
     def test_group_related_files(self, temp_dir):
         """Test grouping of related multi-part files."""
         detector = PartDetector()
@@ -96,6 +123,34 @@ class TestVideoScanner:
         assert "FC2-PPV-1234567" in folder_names
         assert "[DMM] MIDE-123" in folder_names
 
+    def test_scan_directory_deep_tree(self, temp_dir):
+        """Test files at every depth of a deeply nested tree are found."""
+        scanner = VideoScanner(max_workers=1)
+        level = temp_dir
+        for depth in range(40):
+            level = level / f"d{depth}"
+            level.mkdir()
+            (level / f"video_{depth}.mp4").write_bytes(b"x")
+
+        video_files = scanner.scan_directory(temp_dir, recursive=True)
+
+        assert [vf.file_name for vf in video_files] == [
+            f"video_{depth}.mp4" for depth in range(40)
+        ]
+
+    def test_scan_directory_skips_symlinked_dirs(self, temp_dir):
+        """Test a symlink back to a parent never yields a file twice."""
+        scanner = VideoScanner(max_workers=1)
+        sub = temp_dir / "sub"
+        sub.mkdir()
+        (sub / "video.mp4").write_bytes(b"x")
+        (sub / "up").symlink_to("..", target_is_directory=True)
+        (temp_dir / "loop").symlink_to(temp_dir, target_is_directory=True)
+
+        video_files = scanner.scan_directory(temp_dir, recursive=True)
+
+        assert [vf.file_path for vf in video_files] == [sub / "video.mp4"]
+
     def test_scan_directory_non_recursive(self, sample_video_files, temp_dir):
         """Test non-recursive directory scanning."""
         scanner = VideoScanner()
@@ -107,6 +162,28 @@ class TestVideoScanner:
         root_files = [vf for vf in video_files if vf.file_path.parent == temp_dir]
         assert len(root_files) >= 2  # single_movie.mp4 and multi_part files
 
+    def test_scan_threaded_matches_serial(self, sample_video_files, temp_dir):
+        """Test that threaded scanning returns the same files as serial."""
+        serial = VideoScanner(max_workers=1).scan_directory(temp_dir)
+        threaded = VideoScanner(max_workers=4).scan_directory(temp_dir)
+
+        assert [vf.file_path for vf in threaded] == [vf.file_path for vf in serial]
+
+        combined = VideoScanner(max_workers=4).scan_multiple_directories(
+            [temp_dir, temp_dir]
+        )
+        assert len(combined) == 2 * len(serial)
+
+    def test_iter_directory_is_lazy(self, sample_video_files, temp_dir):
+        """Test that iter_directory streams the same files as scan_directory."""
+        scanner = VideoScanner(max_workers=1)
+
+        stream = scanner.iter_directory(temp_dir)
+        assert not isinstance(stream, list)
+
+        streamed = [vf.file_path for vf in stream]
+        assert streamed == [vf.file_path for vf in scanner.scan_directory(temp_dir)]
+
     def test_video_file_creation(self, temp_dir):
         """Test VideoFile object creation."""
         scanner = VideoScanner()
@@ -125,6 +202,11 @@ class TestVideoScanner:
         assert vf.file_name == "FC2-PPV-1234567_part1.mp4"
         assert vf.file_size == len(b"fake video content")
         assert len(vf.detected_parts) >= 1  # Should detect "part1"
+        assert vf.clean_stem == "FC2-PPV-1234567_"
+        st = test_file.stat()
+        assert (vf.st_dev, vf.st_ino) == (st.st_dev, st.st_ino)
+        # Slotted record: no per-instance __dict__ on large scans
+        assert not hasattr(vf, "__dict__")
 
     def test_group_videos(self, temp_dir):
         """Test video grouping functionality."""
@@ -156,18 +238,21 @@ class TestVideoScanner:
         # Video files
         video_extensions = [".mp4", ".mkv", ".avi", ".mov"]
         for ext in video_extensions:
-            file_path = temp_dir / f"video{ext}"
-            file_path.touch()
-            assert scanner._is_video_file(file_path)
+            (temp_dir / f"video{ext}").touch()
 
         # Non-video files
         non_video_extensions = [".txt", ".jpg", ".nfo", ".srt"]
         for ext in non_video_extensions:
-            file_path = temp_dir / f"file{ext}"
-            file_path.touch()
-            assert not scanner._is_video_file(file_path)
+            (temp_dir / f"file{ext}").touch()
+
+        # A directory with a video extension is not a video file
+        (temp_dir / "folder.mp4").mkdir()
 
-        # Directory should not be considered a video file
-        dir_path = temp_dir / "not_a_file"
-        dir_path.mkdir()
-        assert not scanner._is_video_file(dir_path)
+        with os.scandir(temp_dir) as entries:
+            detected = {e.name: scanner._is_video_file(e) for e in entries}
+
+        for ext in video_extensions:
+            assert detected[f"video{ext}"]
+        for ext in non_video_extensions:
+            assert not detected[f"file{ext}"]
+        assert not detected["folder.mp4"]
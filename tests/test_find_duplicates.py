@@ -10,7 +10,12 @@ from click.testing import CliRunner
 # find_duplicates.py lives in scripts/, not in the package
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from find_duplicates import fix_duplicates, format_size, main  # noqa: E402
+from find_duplicates import (  # noqa: E402
+    compute_quick_hash,
+    fix_duplicates,
+    format_size,
+    main,
+)
 from taggrr.core.duplicate_detector import DuplicateSet  # noqa: E402
 from taggrr.core.models import SourceType, VideoFile  # noqa: E402
 
@@ -210,6 +215,26 @@ class TestFixDuplicates:
         assert src_path.samefile(tgt1_path)
         assert src_path.samefile(tgt2_path)
 
+    def test_source_quick_hashed_once_per_set(self, temp_dir):
+        """The source fingerprint is reused for every copy in the set."""
+        src_path = temp_dir / "src" / "ABC-998.mp4"
+        copies = [temp_dir / f"tgt{i}" / "ABC-998.mp4" for i in range(3)]
+        for p in (src_path, *copies):
+            p.parent.mkdir(parents=True)
+            p.write_bytes(b"x" * 1000)
+
+        dup_set = _make_set(
+            _vf(src_path, 1000), copy_files=[_vf(p, 1000) for p in copies]
+        )
+        with patch(
+            "find_duplicates.compute_quick_hash", wraps=compute_quick_hash
+        ) as quick_hash:
+            files_fixed, _ = fix_duplicates([dup_set], auto_confirm=True)
+
+        assert files_fixed == 3
+        hashed = [c.args[0] for c in quick_hash.call_args_list]
+        assert hashed.count(src_path) == 1
+
     def test_error_during_unlink_handled_gracefully(self, temp_dir, capsys):
         """An OS error during unlink is caught and reported; fix count stays 0."""
         src_path = temp_dir / "src" / "ERR-001.mp4"
@@ -351,8 +376,10 @@ class TestCLIIntegration:
         assert "SUMMARY" in result.output
         assert "Duplicate Set" in result.output
 
-    def test_content_match_flag_accepted(self, temp_dir):
+    def test_content_match_flag_accepted(self, temp_dir, monkeypatch):
         """--content-match flag is accepted without error."""
+        db = temp_dir / "hashdb.sqlite"
+        monkeypatch.setattr("taggrr.core.hash_cache.DEFAULT_HASH_DB", db)
         source = temp_dir / "source"
         target = temp_dir / "target"
         source.mkdir()
@@ -363,6 +390,22 @@ class TestCLIIntegration:
         )
         assert result.exit_code == 0
         assert "Content match:   yes" in result.output
+        assert db.exists()
+
+    def test_no_hash_cache_flag(self, temp_dir, monkeypatch):
+        """--no-hash-cache skips the persistent hash database."""
+        db = temp_dir / "hashdb.sqlite"
+        monkeypatch.setattr("taggrr.core.hash_cache.DEFAULT_HASH_DB", db)
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+        source.mkdir()
+        target.mkdir()
+
+        result = CliRunner().invoke(
+            main, [str(source), str(target), "--content-match", "--no-hash-cache"]
+        )
+        assert result.exit_code == 0
+        assert not db.exists()
 
     def test_json_export(self, temp_dir):
         """--output-json writes a valid JSON file with the expected structure."""